@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark de escalamiento de `InferenceWorkerPool` de 1 a N trabajadores.
+
+Genera estudios DICOM sintéticos y mide estudios/segundo para cada número
+de trabajadores, con un hilo intra-op y uno inter-op de TensorFlow por
+proceso.
+
+Uso
+---
+    python -m benchmarks.bench_worker_pool --config config.json --max-workers 16
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+from src.neumonia.synthetic import generate_dataset
+from src.neumonia.worker_pool import InferenceWorkerPool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--studies", type=int, default=64)
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--heatmap", action="store_true", help="Incluir Grad-CAM")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate_dataset(tmp, args.studies, min_size=args.size, max_size=args.size)
+        studies = [(str(i), path) for i, path in enumerate(paths)]
+
+        counts = sorted({1, 2, 4, 8, 16, 32, 64, args.max_workers} & set(range(1, args.max_workers + 1)))
+        print(f"{'workers':>8} {'estudios/s':>12} {'speedup':>8}")
+        baseline = None
+        for n in counts:
+            with InferenceWorkerPool(args.config, n_workers=n, with_heatmap=args.heatmap) as pool:
+                # Calentamiento: una tarea por trabajador
+                list(pool.map(studies[:n]))
+                start = time.perf_counter()
+                list(pool.map(studies))
+                elapsed = time.perf_counter() - start
+            throughput = args.studies / elapsed
+            baseline = baseline or throughput
+            print(f"{n:>8} {throughput:>12.2f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
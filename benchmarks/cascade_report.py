@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Reporte de la cascada de tamizaje: rendimiento frente a concordancia.
+
+Evalúa una carpeta etiquetada (una subcarpeta por clase: ``bacteriana``,
+``normal``, ``viral``) con el modelo completo y con la cascada de
+`Integrator` para varios umbrales, y reporta para cada umbral:
+
+- fracción de estudios resueltos en el tamizaje;
+- ganancia de rendimiento frente al modelo completo con Grad-CAM;
+- concordancia de etiquetas con el modelo completo;
+- no normales según el modelo completo que el tamizaje dio por normales;
+- exactitud frente a las etiquetas de las carpetas.
+
+Los estudios se leen, preprocesan y evalúan en tandas de ``--batch-size``,
+así que la memoria no depende del tamaño de la carpeta. Cada tanda se lee
+una sola vez y se evalúa con el modelo completo y con la cascada para cada
+umbral; los tiempos, medidos por separado para cada pasada, cubren solo la
+etapa del modelo.
+
+Con ``--standin`` funciona sin conexión, con un modelo sustituto y DICOM
+sintéticos repartidos en las tres carpetas; sus etiquetas no tienen
+significado clínico y la cascada no aporta información diagnóstica.
+
+Uso
+---
+    python -m benchmarks.cascade_report datos/etiquetados --thresholds 0.8 0.9 0.95
+    python -m benchmarks.cascade_report --standin --synthetic 48
+"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.neumonia.integrator import Integrator
+from src.neumonia.load_model import LABEL_MAP, NORMAL_INDEX
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.synthetic import generate_dataset, write_standin_config
+
+LABEL_INDEX = {label: index for index, label in LABEL_MAP.items()}
+
+
+def labeled_studies(directory: str, pattern: str = "*.dcm") -> list:
+    """
+    Pares (ruta, índice de clase o None) de una carpeta con una subcarpeta
+    por etiqueta.
+    """
+    studies = []
+    for sub in sorted(Path(directory).iterdir()):
+        if sub.is_dir():
+            label = LABEL_INDEX.get(sub.name.lower())
+            studies.extend((str(path), label) for path in sorted(sub.rglob(pattern)))
+    return studies
+
+
+def timed_labels(integrator: Integrator, img_batch: np.ndarray, cascade: bool):
+    """
+    Evalúa una tanda y devuelve (segundos, índices de clase, marcas de
+    tamizaje).
+    """
+    start = time.perf_counter()
+    results = integrator.predict_preprocessed(img_batch, cascade=cascade)
+    elapsed = time.perf_counter() - start
+    return elapsed, [r.label_index for r in results], [r.screened for r in results]
+
+
+def read_batches(studies: list, batch_size: int):
+    """
+    Lee y preprocesa los estudios en tandas de ``batch_size``.
+
+    Yields
+    ------
+    np.ndarray
+        Lote float32 con shape (N, 512, 512, 1).
+    """
+    for i in range(0, len(studies), batch_size):
+        yield np.concatenate([
+            PreProcessor.preprocess(PreProcessor.read_dicom(path)[0])
+            for path, _ in studies[i:i + batch_size]
+        ]).astype(np.float32)
+
+
+def score(integrator: Integrator, studies: list, thresholds: list, batch_size: int):
+    """
+    Evalúa todos los estudios con el modelo completo y con la cascada para
+    cada umbral.
+
+    Returns
+    -------
+    full : dict
+        ``time`` (segundos) y ``labels`` del modelo completo.
+    cascade : dict
+        Umbral -> ``time``, ``labels`` y ``screened`` de la cascada.
+    """
+    full = {"time": 0.0, "labels": []}
+    cascade = {t: {"time": 0.0, "labels": [], "screened": []} for t in thresholds}
+    for img_batch in read_batches(studies, batch_size):
+        elapsed, labels, _ = timed_labels(integrator, img_batch, cascade=False)
+        full["time"] += elapsed
+        full["labels"].extend(labels)
+        for threshold in thresholds:
+            integrator.cascade_threshold = threshold
+            elapsed, labels, screened = timed_labels(integrator, img_batch, cascade=True)
+            cascade[threshold]["time"] += elapsed
+            cascade[threshold]["labels"].extend(labels)
+            cascade[threshold]["screened"].extend(screened)
+    return full, cascade
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory", nargs="?", help="Carpeta con una subcarpeta por clase")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--standin", action="store_true",
+                        help="Usar un modelo sustituto en lugar de model_path")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Generar este número de DICOM sintéticos en lugar de leer una carpeta")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.9, 0.95, 0.99])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--json", help="Guardar el reporte en este archivo")
+    args = parser.parse_args()
+    if not args.directory and not args.synthetic:
+        parser.error("Indique una carpeta etiquetada o --synthetic N")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = args.config
+        if args.standin:
+            config_path = write_standin_config(tmp)
+
+        directory = args.directory
+        if args.synthetic:
+            directory = os.path.join(tmp, "etiquetados")
+            for index, label in LABEL_MAP.items():
+                count = len(range(index, args.synthetic, len(LABEL_MAP)))
+                generate_dataset(os.path.join(directory, label), count,
+                                 min_size=1024, max_size=2048, seed=index)
+
+        studies = labeled_studies(directory)
+        if not studies:
+            parser.error(f"No hay estudios DICOM en {directory}")
+        truth = np.array([-1 if label is None else label for _, label in studies])
+
+        integrator = Integrator(config_path=config_path, cascade_threshold=args.thresholds[0])
+        # Calentamiento de ambos modelos
+        warm_up = next(read_batches(studies, 1))
+        integrator.predict_preprocessed(warm_up, cascade=False)
+        integrator.screening.predict(warm_up)
+
+        full, cascade = score(integrator, studies, args.thresholds, args.batch_size)
+        integrator.close()
+
+    full_time, full_labels = full["time"], np.array(full["labels"])
+    known = truth >= 0
+    rows = []
+    for threshold in args.thresholds:
+        elapsed = cascade[threshold]["time"]
+        labels = np.array(cascade[threshold]["labels"])
+        screened = np.array(cascade[threshold]["screened"])
+        rows.append({
+            "threshold": threshold,
+            "screened": float(screened.mean()),
+            "speedup": full_time / elapsed,
+            "throughput": len(studies) / elapsed,
+            "agreement": float((labels == full_labels).mean()),
+            "missed_positives": int((screened & (full_labels != NORMAL_INDEX)).sum()),
+            "accuracy": float((labels[known] == truth[known]).mean()) if known.any() else None,
+        })
+
+    report = {
+        "studies": len(studies),
+        "full_throughput": len(studies) / full_time,
+        "full_accuracy": float((full_labels[known] == truth[known]).mean()) if known.any() else None,
+        "cascade": rows,
+    }
+    print(f"Modelo completo: {report['full_throughput']:.2f} estudios/s "
+          f"({len(studies)} estudios)")
+    print(f"{'umbral':>7} {'tamizados':>10} {'ganancia':>9} {'estudios/s':>11} "
+          f"{'concordancia':>13} {'no normales perdidos':>21} {'exactitud':>10}")
+    for row in rows:
+        accuracy = "-" if row["accuracy"] is None else f"{row['accuracy']:.1%}"
+        print(f"{row['threshold']:>7.2f} {row['screened']:>10.1%} {row['speedup']:>8.2f}x "
+              f"{row['throughput']:>11.2f} {row['agreement']:>13.1%} "
+              f"{row['missed_positives']:>21d} {accuracy:>10}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
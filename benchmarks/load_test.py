@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Prueba de carga: estudios/segundo sostenidos por un nodo.
+
+Genera DICOM sintéticos de tamaño realista, envía solicitudes al
+`Integrator` (modo ``integrator``, hilos concurrentes) o a la fachada
+asíncrona (modo ``async``, `Integrator.aprocess`) con una concurrencia y
+una tasa de llegada configurables, y reporta rendimiento, percentiles de
+latencia, CPU y RSS a lo largo del tiempo.
+
+Con ``--standin`` funciona sin conexión, usando un modelo sustituto con la
+misma entrada y la capa ``conv10_thisone`` de ``conv_MLP_84.h5``.
+
+La latencia se mide desde el instante programado de llegada, de modo que
+incluye el tiempo en cola cuando el sistema no da abasto. Con ``--rate 0``
+cada cliente envía la siguiente solicitud al terminar la anterior (lazo
+cerrado).
+
+Uso
+---
+    python -m benchmarks.load_test --standin --mode async --concurrency 32 --rate 20
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.neumonia.integrator import Integrator
+from src.neumonia.resources import CPUMeter, current_rss_bytes
+from src.neumonia.synthetic import generate_dataset, write_standin_config
+
+
+class Sampler(threading.Thread):
+    """
+    Registra CPU, RSS y solicitudes completadas cada ``interval`` segundos.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.completed = 0
+        self.samples = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def record(self):
+        """
+        Cuenta una solicitud completada.
+        """
+        with self._lock:
+            self.completed += 1
+
+    def run(self):
+        meter = CPUMeter()
+        start = time.perf_counter()
+        last = 0
+        while not self._stop_event.wait(self.interval):
+            done = self.completed
+            self.samples.append({
+                "t": time.perf_counter() - start,
+                "cpu_percent": meter.percent(),
+                "rss_mb": current_rss_bytes() / 2 ** 20,
+                "throughput": (done - last) / self.interval,
+            })
+            last = done
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def arrival_times(count: int, rate: float, poisson: bool, rng: np.random.Generator) -> np.ndarray:
+    """
+    Instantes de llegada (segundos desde el inicio) para un lazo abierto.
+    """
+    if poisson:
+        return np.cumsum(rng.exponential(1.0 / rate, count))
+    return np.arange(count) / rate
+
+
+def run_threads(integrator, paths, args, sampler, rng) -> list:
+    """
+    Modo ``integrator``: cada solicitud lee el DICOM y predice en un hilo.
+    """
+    def work(path, scheduled):
+        array, _ = integrator.load_image(path)
+        integrator.predict(array)
+        latency = time.perf_counter() - scheduled
+        sampler.record()
+        return latency
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        if args.rate > 0:
+            futures = []
+            for i, offset in enumerate(arrival_times(args.requests, args.rate, args.poisson, rng)):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(work, paths[i % len(paths)], start + offset))
+            return [f.result() for f in futures]
+
+        counter = iter(range(args.requests))
+        lock = threading.Lock()
+
+        def client():
+            latencies = []
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return latencies
+                latencies.append(work(paths[i % len(paths)], time.perf_counter()))
+
+        clients = [executor.submit(client) for _ in range(args.concurrency)]
+        return [latency for c in clients for latency in c.result()]
+
+
+def run_async(integrator, paths, args, sampler, rng) -> list:
+    """
+    Modo ``async``: solicitudes concurrentes a `Integrator.aprocess`.
+    """
+    async def main():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def request(i, scheduled):
+            async with semaphore:
+                await integrator.aprocess(paths[i % len(paths)], str(i))
+            sampler.record()
+            return loop.time() - scheduled
+
+        if args.rate > 0:
+            tasks = []
+            for i, offset in enumerate(arrival_times(args.requests, args.rate, args.poisson, rng)):
+                delay = start + offset - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(request(i, start + offset)))
+            return await asyncio.gather(*tasks)
+
+        # Lazo cerrado: ``concurrency`` clientes, cada uno envía su siguiente
+        # solicitud al recibir la respuesta, como en ``run_threads``
+        counter = iter(range(args.requests))
+
+        async def client():
+            return [await request(i, loop.time()) for i in counter]
+
+        clients = await asyncio.gather(*[client() for _ in range(args.concurrency)])
+        return [latency for latencies in clients for latency in latencies]
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--standin", action="store_true",
+                        help="Usar un modelo sustituto en lugar de model_path")
+    parser.add_argument("--mode", choices=("integrator", "async"), default="integrator")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Solicitudes por segundo (0 = lazo cerrado)")
+    parser.add_argument("--poisson", action="store_true", help="Llegadas de Poisson")
+    parser.add_argument("--files", type=int, default=8, help="DICOM sintéticos distintos")
+    parser.add_argument("--min-size", type=int, default=2000)
+    parser.add_argument("--max-size", type=int, default=4000)
+    parser.add_argument("--interval", type=float, default=1.0, help="Segundos entre muestras")
+    parser.add_argument("--json", help="Guardar el reporte en este archivo")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = args.config
+        if args.standin:
+            config_path = write_standin_config(tmp)
+
+        paths = generate_dataset(os.path.join(tmp, "dicom"), args.files,
+                                 args.min_size, args.max_size)
+        integrator = Integrator(config_path=config_path)
+        integrator.predict(integrator.load_image(paths[0])[0])  # calentamiento
+
+        sampler = Sampler(args.interval)
+        sampler.start()
+        start = time.perf_counter()
+        runner = run_async if args.mode == "async" else run_threads
+        latencies = np.asarray(runner(integrator, paths, args, sampler, rng))
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+        integrator.close()
+
+    report = {
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "elapsed_s": elapsed,
+        "throughput": args.requests / elapsed,
+        "latency_ms": {
+            f"p{q}": float(np.percentile(latencies, q) * 1000) for q in (50, 90, 95, 99)
+        },
+        "samples": sampler.samples,
+    }
+    report["latency_ms"]["max"] = float(latencies.max() * 1000)
+
+    print(f"{'t (s)':>7} {'estudios/s':>11} {'CPU %':>7} {'RSS MB':>8}")
+    for sample in sampler.samples:
+        print(f"{sample['t']:>7.1f} {sample['throughput']:>11.2f} "
+              f"{sample['cpu_percent']:>7.1f} {sample['rss_mb']:>8.1f}")
+    print(f"\nRendimiento: {report['throughput']:.2f} estudios/s "
+          f"({args.requests} en {elapsed:.1f} s)")
+    print("Latencia (ms): " + ", ".join(f"{k}={v:.1f}" for k, v in report["latency_ms"].items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
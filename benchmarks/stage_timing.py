@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tiempos por etapa con línea base: detecta regresiones de rendimiento.
+
+Mide la mediana por imagen de cada etapa (``read_dicom``, ``preprocess`` y
+``predict``, el modelo completo con Grad-CAM) sobre DICOM sintéticos de
+tamaño realista. Con ``--save`` guarda los tiempos como línea base; con
+``--check`` los compara y termina con código 1 si alguna etapa es más
+lenta que la línea base en más de ``--max-regression`` por ciento.
+
+Las líneas base dependen de la máquina: deben generarse y compararse en el
+mismo equipo.
+
+Uso
+---
+    python -m benchmarks.stage_timing --standin --save outputs/benchmarks/etapas.json
+    python -m benchmarks.stage_timing --standin --check outputs/benchmarks/etapas.json --max-regression 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Callable, Dict, Sequence
+
+import numpy as np
+
+from src.neumonia.pre_processor import PreProcessor
+
+
+def _median_per_image(stage: Callable, items: Sequence, repeats: int) -> float:
+    """
+    Mediana (entre repeticiones) del tiempo medio por elemento de ``stage``.
+    """
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for item in items:
+            stage(item)
+        samples.append((time.perf_counter() - start) / len(items))
+    return float(np.median(samples))
+
+
+def measure_stages(paths: Sequence[str], predict: Callable[[np.ndarray], object],
+                   repeats: int = 5) -> Dict[str, float]:
+    """
+    Mide cada etapa sobre DICOM de un solo frame.
+
+    Parameters
+    ----------
+    paths : sequence of str
+        Archivos DICOM.
+    predict : callable
+        Función que recibe un lote preprocesado (por ejemplo
+        ``Integrator.predict_preprocessed``).
+    repeats : int, optional
+        Repeticiones; se reporta la mediana (por defecto 5).
+
+    Returns
+    -------
+    dict
+        Etapa -> segundos por imagen.
+    """
+    arrays = [PreProcessor.read_dicom(path)[0] for path in paths]
+    batches = [PreProcessor.preprocess(array) for array in arrays]
+    predict(batches[0])  # calentamiento
+    return {
+        "read_dicom": _median_per_image(PreProcessor.read_dicom, paths, repeats),
+        "preprocess": _median_per_image(PreProcessor.preprocess, arrays, repeats),
+        "predict": _median_per_image(predict, batches, repeats),
+    }
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float],
+            max_regression: float) -> Dict[str, float]:
+    """
+    Etapas más lentas que la línea base en más de ``max_regression`` %.
+
+    Returns
+    -------
+    dict
+        Etapa -> regresión en por ciento, solo para las que superan el límite.
+    """
+    regressions = {}
+    for stage, seconds in current.items():
+        reference = baseline.get(stage)
+        if reference:
+            change = (seconds / reference - 1) * 100
+            if change > max_regression:
+                regressions[stage] = change
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--standin", action="store_true",
+                        help="Usar un modelo sustituto en lugar de model_path")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--min-size", type=int, default=2000)
+    parser.add_argument("--max-size", type=int, default=3000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", help="Guardar los tiempos como línea base")
+    parser.add_argument("--check", help="Comparar con esta línea base")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="Regresión máxima permitida por etapa, en por ciento")
+    args = parser.parse_args()
+
+    from src.neumonia.integrator import Integrator
+    from src.neumonia.synthetic import generate_dataset, write_standin_config
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = args.config
+        if args.standin:
+            config_path = write_standin_config(tmp)
+        paths = generate_dataset(os.path.join(tmp, "dicom"), args.files,
+                                 args.min_size, args.max_size)
+        integrator = Integrator(config_path=config_path)
+        timings = measure_stages(paths, integrator.predict_preprocessed, args.repeats)
+        integrator.close()
+
+    for stage, seconds in timings.items():
+        print(f"{stage:>12}: {seconds * 1000:8.2f} ms/imagen")
+    if args.save:
+        if os.path.dirname(args.save):
+            os.makedirs(os.path.dirname(args.save), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(timings, f, indent=2)
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            regressions = compare(timings, json.load(f), args.max_regression)
+        for stage, change in regressions.items():
+            print(f"Regresión en {stage}: +{change:.1f}% (límite {args.max_regression:.0f}%)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Fachada asyncio para el integrador.
+
+:class:`AsyncBatcher` permite atender muchas solicitudes concurrentes sin
+bloquear el event loop:
+
+- La lectura del archivo, la decodificación y el preprocesamiento se
+  ejecutan en un pool de hilos de E/S.
+- Las imágenes preprocesadas que llegan dentro de una ventana corta se
+  agrupan en un solo lote y comparten una pasada del modelo, que se
+  ejecuta en un hilo dedicado.
+- Una solicitud cancelada (o vencida por ``timeout``) antes de que su lote
+  se ejecute se descarta del lote.
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.result import PredictionResult
+
+
+class AsyncBatcher:
+    """
+    Agrupa solicitudes asíncronas concurrentes en lotes para el modelo.
+
+    Parameters
+    ----------
+    integrator : Integrator
+        Integrador que ejecuta las predicciones.
+    max_batch_size : int, optional
+        Máximo de imágenes por pasada del modelo (por defecto 8).
+    max_delay : float, optional
+        Segundos que se espera a más solicitudes tras la primera de un lote
+        (por defecto 0.005).
+    io_workers : int, optional
+        Hilos para lectura, decodificación y preprocesamiento. Por defecto
+        el mismo criterio que ``ThreadPoolExecutor``.
+    """
+
+    def __init__(self, integrator, max_batch_size: int = 8, max_delay: float = 0.005,
+                 io_workers: Optional[int] = None):
+        self.integrator = integrator
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=io_workers or min(32, (os.cpu_count() or 1) + 4),
+            thread_name_prefix="neumonia-io",
+        )
+        # TensorFlow ya paraleliza cada pasada; un solo hilo evita competir
+        self.model_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="neumonia-model")
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+
+    def _ensure_started(self):
+        """
+        Crea la cola y la tarea colectora en el event loop actual.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self._queue = asyncio.Queue()
+            self._collector = loop.create_task(self._collect())
+
+    @staticmethod
+    def _load(source) -> np.ndarray:
+        """
+        Lee y preprocesa un estudio (ruta, bytes o imagen ya cargada).
+        """
+        if isinstance(source, np.ndarray):
+            array = source
+        else:
+            array, _ = PreProcessor.read_dicom(source)
+        return PreProcessor.preprocess(array)
+
+    async def _collect(self):
+        """
+        Tarea de fondo: forma lotes con las solicitudes pendientes y los
+        envía al hilo del modelo.
+        """
+        while True:
+            pending = [await self._queue.get()]
+            if self.max_batch_size > 1 and self.max_delay > 0:
+                # Ventana corta para que lleguen más solicitudes concurrentes
+                await asyncio.sleep(self.max_delay)
+            while len(pending) < self.max_batch_size and not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            # Las solicitudes canceladas mientras esperaban no se ejecutan
+            pending = [p for p in pending if not p[2].done()]
+            if not pending:
+                continue
+            img_batch = np.concatenate([p[0] for p in pending])
+            patient_ids = [p[1] for p in pending]
+            try:
+                results = await self.loop.run_in_executor(
+                    self.model_executor, self.integrator.predict_preprocessed, img_batch, patient_ids
+                )
+            except Exception as exc:
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, _, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def process(self, source, patient_id: str = "") -> PredictionResult:
+        """
+        Procesa un estudio sin bloquear el event loop.
+
+        Parameters
+        ----------
+        source : str, bytes, memoryview or np.ndarray
+            Ruta al DICOM, su contenido en memoria o la imagen ya cargada.
+        patient_id : str, optional
+            Identificador del paciente.
+
+        Returns
+        -------
+        PredictionResult
+            Resultado de la predicción.
+        """
+        self._ensure_started()
+        img_batch = await self.loop.run_in_executor(self.io_executor, self._load, source)
+        future = self.loop.create_future()
+        await self._queue.put((img_batch, patient_id, future))
+        return await future
+
+    def close(self):
+        """
+        Detiene la tarea colectora y libera los pools de hilos.
+        """
+        if self._collector is not None:
+            self._collector.cancel()
+            self._collector = None
+        self.io_executor.shutdown(wait=False, cancel_futures=True)
+        self.model_executor.shutdown(wait=False, cancel_futures=True)
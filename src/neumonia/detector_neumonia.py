@@ -12,6 +12,8 @@ Este módulo implementa una aplicación basada en Tkinter que permite:
 """
 
 import os
+import json
+import atexit
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 
 from tkinter import *
@@ -22,6 +24,7 @@ import pyautogui
 
 # Importar integrador
 from .integrator import Integrator
+from .inference_process import InferenceProcessClient
 
 
 class App:
@@ -42,7 +45,10 @@ class App:
         - Se definen las etiquetas, campos de texto, botones y disposición
           de la interfaz.
         - Se crea una instancia de :class:`Integrator` para manejar la lógica
-          de predicción y generación de reportes.
+          de predicción y generación de reportes, o un
+          :class:`InferenceProcessClient` si la clave ``inference_process``
+          de ``config.json`` es verdadera. Se cierra con la ventana
+          (:meth:`on_close`) o, en último caso, con ``atexit``.
         - El ciclo principal de Tkinter se inicia automáticamente.
         """
         self.root = Tk()
@@ -52,8 +58,17 @@ class App:
         self.root.geometry("815x560")
         self.root.resizable(0, 0)
 
-        # Crear instancia del integrador
-        self.integrator = Integrator()
+        # Crear instancia del integrador (en proceso o en un proceso aparte)
+        with open("config.json", "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if config.get("inference_process", False):
+            self.integrator = InferenceProcessClient()
+        else:
+            self.integrator = Integrator()
+        # Detener los hilos y el proceso de inferencia y borrar los buffers
+        # compartidos al cerrar la ventana o al salir por otra vía
+        atexit.register(self.integrator.close)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Labels
         self.lab1 = ttk.Label(self.root, text="Imagen Radiográfica", font=fonti)
@@ -66,6 +81,7 @@ class App:
         # Variables
         self.ID = StringVar()
         self.array = None
+        self.filepath = None
         self.reportID = 0
         self.label = ""
         self.proba = 0.0
@@ -116,7 +132,8 @@ class App:
 
         Notes
         -----
-        - La imagen se convierte internamente en un array mediante el integrador.
+        - Se muestra una vista previa reducida, tomada de la caché si existe;
+          la imagen completa se decodifica como máximo una vez.
         """
         filepath = filedialog.askopenfilename(
             initialdir="/",
@@ -129,9 +146,16 @@ class App:
             ),
         )
         if filepath:
-            self.array, img2show = self.integrator.load_image(filepath)
-            self.img1 = img2show.resize((250, 250), Image.Resampling.LANCZOS)
-            self.img1 = ImageTk.PhotoImage(self.img1)
+            # La vista previa sale de la caché si existe; la imagen completa
+            # solo se decodifica cuando la necesita la predicción
+            preview, self.array = self.integrator.load_preview(filepath)
+            self.filepath = filepath
+            # Soltar el resultado anterior, que referencia la imagen previa
+            self.heatmap = None
+            self.img1 = ImageTk.PhotoImage(preview)
+            # Reemplazar (no acumular) las imágenes mostradas
+            self.text_img1.delete(1.0, END)
+            self.text_img2.delete(1.0, END)
             self.text_img1.image_create(END, image=self.img1)
             self.button1["state"] = "enabled"
 
@@ -149,15 +173,20 @@ class App:
         - Los resultados incluyen la clase predicha y la probabilidad.
         """
         patient_id = self.ID.get()
+        if self.array is None:
+            self.array, _ = self.integrator.load_image(self.filepath)
         self.label, self.proba, self.heatmap = (
-            self.integrator.process_image_from_array(self.array, patient_id) 
+            self.integrator.process_image_from_array(self.array, patient_id, lazy_heatmap=True)
         )
 
-        self.img2 = Image.fromarray(self.heatmap)
-        self.img2 = self.img2.resize((250, 250), Image.Resampling.LANCZOS)
+        # Superponer el Grad-CAM directamente al tamaño de la miniatura
+        self.img2 = Image.fromarray(self.heatmap.render((250, 250)))
         self.img2 = ImageTk.PhotoImage(self.img2)
+        self.text_img2.delete(1.0, END)
         self.text_img2.image_create(END, image=self.img2)
+        self.text2.delete(1.0, END)
         self.text2.insert(END, self.label)
+        self.text3.delete(1.0, END)
         self.text3.insert(END, f"{self.proba:.2f}%")
 
     def save_results_csv(self):
@@ -195,6 +224,13 @@ class App:
         self.reportID += 1
         showinfo(title="PDF", message=f"PDF generado en {pdf_path}")
 
+    def on_close(self):
+        """
+        Cierra el integrador y la ventana.
+        """
+        self.integrator.close()
+        self.root.destroy()
+
     def delete(self):
         """
         Elimina todos los datos y resetea la interfaz gráfica.
@@ -7,6 +7,8 @@ Clase para la predicción de neumonía y generación de Grad-CAM.
 import os
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 
+from typing import Dict, Tuple
+
 import numpy as np
 import tensorflow as tf
 import cv2
@@ -28,45 +30,179 @@ class GradCAMModel:
             self.model = tf.keras.models.load_model(model, compile=False)
         else:
             self.model = model
+        self._grad_models: Dict[str, tf.keras.Model] = {}
 
-    def grad_cam(self,img_input:np.ndarray, array: np.ndarray, layer_name: str = "conv10_thisone") -> np.ndarray:
+    def _grad_model(self, layer_name: str) -> tf.keras.Model:
         """
-        Genera un mapa de calor Grad-CAM sobre la imagen.
+        Modelo auxiliar que devuelve la activación de ``layer_name`` y la
+        predicción. Se construye una sola vez por capa: crear un modelo
+        nuevo en cada llamada acumula grafos y capas durante una sesión
+        larga.
+        """
+        grad_model = self._grad_models.get(layer_name)
+        if grad_model is None:
+            inputs = self.model.inputs
+            grad_model = tf.keras.models.Model(
+                inputs=inputs[0] if len(inputs) == 1 else inputs,
+                outputs=[self.model.get_layer(layer_name).output, self.model.output]
+            )
+            self._grad_models[layer_name] = grad_model
+        return grad_model
+
+    def warm_up(self, layer_name: str = "conv10_thisone") -> None:
+        """
+        Construye el modelo auxiliar y ejecuta :meth:`compute_cam` sobre un
+        lote de ceros, para que la primera solicitud real no pague ese costo.
         """
-        
-        conv_layer = self.model.get_layer(layer_name)
-        grad_model = tf.keras.models.Model(
-            inputs=self.model.inputs,
-            outputs=[conv_layer.output, self.model.output]
-        )
+        shape = [1 if dim is None else dim for dim in self.model.inputs[0].shape]
+        self.compute_cam(np.zeros(shape, dtype=np.float32), layer_name)
+
+    def compute_cam(self, img_input: np.ndarray,
+                    layer_name: str = "conv10_thisone") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula el mapa Grad-CAM crudo, a la resolución nativa de la capa
+        convolucional, junto con las predicciones del modelo.
+
+        La pasada hacia adelante del Grad-CAM ya produce las probabilidades,
+        por lo que no hace falta llamar a ``model.predict`` por separado.
+
+        Parameters
+        ----------
+        img_input : np.ndarray
+            Lote preprocesado con shape (N, 512, 512, 1).
+        layer_name : str, optional
+            Capa convolucional usada para el Grad-CAM.
+
+        Returns
+        -------
+        cams : np.ndarray
+            Mapas normalizados a [0, 1] con shape (N, h, w) en float16.
+        preds : np.ndarray
+            Probabilidades por clase con shape (N, clases) en float32.
+        """
+        grad_model = self._grad_model(layer_name)
 
         with tf.GradientTape() as tape:
             conv_outputs, predictions = grad_model(img_input)
             # Asegurar tensor float32
             predictions = tf.convert_to_tensor(predictions, dtype=tf.float32)
-            # Índice de la clase más probable
-            argmax = tf.argmax(predictions[0])
-            # Selección segura de la clase con tf.gather
-            loss = tf.gather(predictions[0], argmax)
+            # Probabilidad de la clase más probable de cada imagen; las
+            # muestras del lote son independientes, así que la suma da
+            # el gradiente de cada una por separado
+            argmax = tf.argmax(predictions, axis=-1)
+            loss = tf.reduce_sum(tf.gather(predictions, argmax, axis=1, batch_dims=1))
 
         grads = tape.gradient(loss, conv_outputs)
-        pooled_grads = tf.reduce_mean(grads, axis=(0, 1, 2))
-        conv_outputs = conv_outputs[0].numpy()
-        pooled_grads = pooled_grads.numpy()
+        pooled_grads = tf.reduce_mean(grads, axis=(1, 2))
+
+        # Ponderar cada canal por su gradiente medio y promediar canales
+        heatmaps = tf.einsum("nhwc,nc->nhw", conv_outputs, pooled_grads)
+        heatmaps = heatmaps.numpy() / conv_outputs.shape[-1]
+        heatmaps = np.maximum(heatmaps, 0)
+        max_values = heatmaps.max(axis=(1, 2), keepdims=True)
+        np.divide(heatmaps, max_values, out=heatmaps, where=max_values != 0)
+
+        return heatmaps.astype(np.float16), predictions.numpy()
+
+    @staticmethod
+    def render_overlay(cam: np.ndarray, array: np.ndarray,
+                       size: Tuple[int, int] = (512, 512)) -> np.ndarray:
+        """
+        Colorea un mapa Grad-CAM crudo y lo superpone a la imagen original.
 
-        for i in range(conv_outputs.shape[-1]):
-            conv_outputs[:, :, i] *= pooled_grads[i]
+        El mapa y la imagen se llevan directamente al tamaño pedido, de modo
+        que una miniatura para la interfaz no pasa por una imagen intermedia
+        de 512x512. Al reducir la imagen original se usa ``INTER_AREA``,
+        que promedia píxeles y evita el aliasing de imágenes grandes.
 
-        heatmap = np.mean(conv_outputs, axis=-1)
-        heatmap = np.maximum(heatmap, 0)
-        if np.max(heatmap) != 0:
-            heatmap /= np.max(heatmap)
+        Parameters
+        ----------
+        cam : np.ndarray
+            Mapa normalizado a [0, 1] con shape (h, w).
+        array : np.ndarray
+            Imagen original en formato RGB.
+        size : tuple of int, optional
+            Tamaño (ancho, alto) del resultado (por defecto 512x512).
 
-        heatmap = cv2.resize(heatmap, (img_input.shape[2], img_input.shape[1]))
+        Returns
+        -------
+        np.ndarray
+            Imagen con el mapa de calor superpuesto.
+        """
+        heatmap = cv2.resize(cam.astype(np.float32), size)
         heatmap = np.uint8(255 * heatmap)
         heatmap = cv2.applyColorMap(heatmap, cv2.COLORMAP_JET)
-        img_resized = cv2.resize(array, (512, 512))
-        superimposed_img = cv2.addWeighted(img_resized, 1.0, heatmap, 0.4, 0)
-        return superimposed_img
+        shrinking = array.shape[1] > size[0] or array.shape[0] > size[1]
+        interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+        img_resized = cv2.resize(array, size, interpolation=interpolation)
+        return cv2.addWeighted(img_resized, 1.0, heatmap, 0.4, 0)
+
+    def grad_cam(self,img_input:np.ndarray, array: np.ndarray, layer_name: str = "conv10_thisone",
+                 native: bool = False) -> np.ndarray:
+        """
+        Genera un mapa de calor Grad-CAM sobre la imagen.
+
+        Con ``native=True`` se devuelve el mapa crudo a la resolución de la
+        capa convolucional (float16 en [0, 1]), sin escalar ni colorear; se
+        puede superponer después al tamaño deseado con :meth:`render_overlay`.
+        """
+        cams, _ = self.compute_cam(img_input, layer_name)
+        if native:
+            return cams[0]
+        return self.render_overlay(cams[0], array, (img_input.shape[2], img_input.shape[1]))
+
+
+class LazyHeatmap:
+    """
+    Mapa Grad-CAM cuya superposición coloreada se genera solo al usarse.
+
+    Guarda el mapa crudo en float16 a la resolución de la capa convolucional
+    y una referencia a la imagen original; cada superposición (colormap y
+    mezcla) se calcula en el primer acceso a un tamaño dado y se conserva.
+
+    Parameters
+    ----------
+    cam : np.ndarray
+        Mapa normalizado a [0, 1] con shape (h, w).
+    array : np.ndarray
+        Imagen original en formato RGB.
+    """
+
+    __slots__ = ("cam", "_array", "_overlays")
+
+    def __init__(self, cam: np.ndarray, array: np.ndarray):
+        self.cam = cam
+        self._array = array
+        self._overlays: Dict[Tuple[int, int], np.ndarray] = {}
+
+    @property
+    def rendered(self) -> bool:
+        """
+        Indica si ya se generó alguna superposición.
+        """
+        return bool(self._overlays)
+
+    def render(self, size: Tuple[int, int] = (512, 512)) -> np.ndarray:
+        """
+        Devuelve la imagen con el Grad-CAM superpuesto, generándola si
+        aún no existe para ese tamaño.
+
+        Parameters
+        ----------
+        size : tuple of int, optional
+            Tamaño (ancho, alto) del resultado (por defecto 512x512), por
+            ejemplo el de la miniatura de la interfaz.
+
+        Returns
+        -------
+        np.ndarray
+            Imagen RGB con el mapa de calor superpuesto.
+        """
+        size = tuple(size)
+        if size not in self._overlays:
+            self._overlays[size] = GradCAMModel.render_overlay(self.cam, self._array, size)
+        return self._overlays[size]
 
-    
+    def __array__(self, dtype=None, copy=None):
+        overlay = self.render()
+        return overlay if dtype is None else overlay.astype(dtype)
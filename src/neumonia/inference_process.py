@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Inferencia en un proceso separado con intercambio de imágenes sin copias.
+
+Las imágenes viajan entre la interfaz y el proceso de inferencia como
+archivos mapeados en memoria (``np.memmap``) sobre ``/dev/shm`` cuando
+existe. Por la tubería solo se envía un descriptor (ruta, shape, dtype), de
+modo que la latencia del intercambio no depende del tamaño de la imagen:
+
+- :meth:`InferenceProcessClient.load_image` reserva el buffer a partir del
+  encabezado DICOM y el proceso de inferencia escribe en él la imagen RGB
+  (:meth:`PreProcessor.to_rgb` con ``out``), sin una copia intermedia.
+- :meth:`InferenceProcessClient.process_image_from_array` reutiliza ese
+  buffer; el proceso devuelve el Grad-CAM crudo en float16 (unos KB) y la
+  superposición se genera en el cliente al mostrarla.
+
+El proceso de inferencia predice con un :class:`Integrator` creado con la
+misma configuración, de modo que ``tta_threshold``, ``cascade_threshold``,
+``hot_reload``, ``max_rss_mb``, los hilos de la sesión y ``shadow_models``
+se aplican igual que en el mismo proceso.
+"""
+
+import os
+import json
+import tempfile
+import multiprocessing
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.neumonia.csv_handler import CSVHandler
+from src.neumonia.grad_cam import LazyHeatmap
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.preview_cache import PreviewCache
+from src.neumonia.result import PredictionResult
+
+
+class SharedBuffer:
+    """
+    Arreglo NumPy respaldado por un archivo mapeado en memoria compartida.
+
+    Parameters
+    ----------
+    path : str
+        Ruta del archivo de respaldo.
+    shape : tuple of int
+        Forma del arreglo.
+    dtype : str
+        Tipo de dato en notación de NumPy (por ejemplo ``"|u1"``).
+    """
+
+    def __init__(self, path: str, shape: Tuple[int, ...], dtype: str):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.array = np.memmap(path, dtype=np.dtype(dtype), mode="r+", shape=self.shape)
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype="uint8", directory: Optional[str] = None):
+        """
+        Crea un buffer nuevo del tamaño indicado.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Forma del arreglo.
+        dtype : str or np.dtype, optional
+            Tipo de dato (por defecto uint8).
+        directory : str, optional
+            Carpeta del archivo; por defecto ``/dev/shm`` si existe.
+        """
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        dtype = np.dtype(dtype)
+        fd, path = tempfile.mkstemp(prefix="neumonia-", suffix=".buf", dir=directory)
+        with os.fdopen(fd, "wb") as file:
+            file.truncate(max(1, int(np.prod(shape)) * dtype.itemsize))
+        return cls(path, shape, dtype.str)
+
+    @classmethod
+    def attach(cls, descriptor: tuple):
+        """
+        Abre un buffer existente a partir de su descriptor.
+        """
+        return cls(*descriptor)
+
+    @property
+    def descriptor(self) -> tuple:
+        """
+        Tupla (ruta, shape, dtype) que identifica el buffer entre procesos.
+        """
+        return (self.path, self.shape, self.dtype)
+
+    def unlink(self):
+        """
+        Elimina el archivo de respaldo. Los arreglos ya mapeados siguen
+        siendo válidos hasta que se liberan.
+        """
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _serve(config_path: str, conn):
+    """
+    Bucle del proceso de inferencia: atiende solicitudes hasta recibir None.
+    """
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    from src.neumonia.integrator import Integrator
+
+    try:
+        integrator = Integrator(config_path=config_path)
+    except Exception as exc:
+        conn.send(("error", exc))
+        conn.close()
+        return
+    conn.send(("ok", None))
+
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        command, descriptor, argument = message
+        try:
+            target = SharedBuffer.attach(descriptor)
+            if command == "load":
+                PreProcessor.read_first_frame(argument, out=target.array)
+                reply = None
+            else:
+                patient_id, cascade = argument
+                reply = integrator.predict_batch([target.array], [patient_id], cascade)[0]
+            del target
+            conn.send(("ok", reply))
+        except Exception as exc:
+            conn.send(("error", exc))
+    integrator.close()
+    conn.close()
+
+
+class InferenceProcessClient:
+    """
+    Sustituto de :class:`Integrator` para la interfaz que ejecuta la
+    decodificación y el modelo en un proceso aparte.
+
+    Expone los mismos métodos que usa la interfaz (``load_image``,
+    ``load_preview``, ``process_image_from_array``, ``save_result`` y ``generate_pdf``).
+
+    Parameters
+    ----------
+    config_path : str, optional
+        Ruta al archivo de configuración JSON (por defecto "config.json").
+    buffer_dir : str, optional
+        Carpeta de los buffers compartidos; por defecto ``/dev/shm``.
+    """
+
+    def __init__(self, config_path: str = "config.json", buffer_dir: Optional[str] = None):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if "model_path" not in config:
+            raise KeyError("El archivo JSON debe contener 'model_path'.")
+        if not os.path.exists(config["model_path"]):
+            raise FileNotFoundError(
+                f"No se encontró el archivo del modelo: {config['model_path']}"
+            )
+
+        self.config_path = config_path
+        self.buffer_dir = buffer_dir
+        self.csv_handler = CSVHandler(config_path=config_path)
+        self._pdf_generator = None
+        self._image: Optional[SharedBuffer] = None
+        self.preview_cache = PreviewCache(
+            os.path.join(config.get("cache_path", "outputs/cache"), "previews")
+        )
+
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve, args=(config_path, child_conn),
+            name="neumonia-inference", daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._request()
+
+    def _request(self, message=None):
+        """
+        Envía una solicitud (si hay) y espera la respuesta del proceso.
+        """
+        if message is not None:
+            self._conn.send(message)
+        status, payload = self._conn.recv()
+        if status == "error":
+            raise payload
+        return payload
+
+    def load_image(self, path: str) -> Tuple[np.ndarray, Image.Image]:
+        """
+        Carga un DICOM: el proceso de inferencia lo decodifica en un buffer
+        compartido del tamaño que indica el encabezado.
+
+        De un DICOM multi-frame se carga solo el primer frame, como en la
+        vista previa.
+
+        Parameters
+        ----------
+        path : str
+            Ruta al archivo DICOM.
+
+        Returns
+        -------
+        array : np.ndarray
+            Imagen RGB respaldada por memoria compartida.
+        img_pil : PIL.Image.Image
+            Imagen para mostrar en la interfaz.
+        """
+        header = PreProcessor.read_header(path)
+        image = SharedBuffer.create((header["Rows"], header["Columns"], 3), "uint8", self.buffer_dir)
+        try:
+            self._request(("load", image.descriptor, os.fspath(path)))
+        except Exception:
+            image.unlink()
+            raise
+        if self._image is not None:
+            self._image.unlink()
+        self._image = image
+        return image.array, Image.fromarray(np.asarray(image.array))
+
+    def load_preview(self, path: str) -> Tuple[Image.Image, Optional[np.ndarray]]:
+        """
+        Igual que :meth:`Integrator.load_preview`; si no está en la caché la
+        imagen se decodifica en el buffer compartido.
+        """
+        preview = self.preview_cache.get(path)
+        if preview is not None:
+            return preview, None
+        array, _ = self.load_image(path)
+        return self.preview_cache.put(path, array), array
+
+    def predict(self, array: np.ndarray, patient_id: str = "",
+                cascade: Optional[bool] = None) -> PredictionResult:
+        """
+        Igual que :meth:`Integrator.predict`, en el proceso de inferencia.
+
+        Si ``array`` es la imagen devuelta por :meth:`load_image` solo se
+        envía su descriptor; en otro caso se copia una vez a un buffer
+        compartido temporal.
+
+        Parameters
+        ----------
+        cascade : bool, optional
+            Ver :meth:`Integrator.predict_preprocessed`.
+        """
+        if self._image is not None and array is self._image.array:
+            return self._request(("predict", self._image.descriptor, (patient_id, cascade)))
+        buffer = SharedBuffer.create(array.shape, array.dtype, self.buffer_dir)
+        try:
+            buffer.array[...] = array
+            return self._request(("predict", buffer.descriptor, (patient_id, cascade)))
+        finally:
+            buffer.unlink()
+
+    def process_image_from_array(self, array: np.ndarray, patient_id: str,
+                                 lazy_heatmap: bool = False):
+        """
+        Igual que :meth:`Integrator.process_image_from_array`, ejecutando
+        el modelo en el proceso de inferencia.
+        """
+        # La interfaz siempre muestra el Grad-CAM: sin cascada
+        result = self.predict(array, patient_id, cascade=False)
+        heatmap = LazyHeatmap(result.cam, array)
+        if lazy_heatmap:
+            return result.label, result.prob, heatmap
+        return result.label, result.prob, heatmap.render()
+
+    def save_result(self, patient_id: str, label: str, prob: float):
+        """
+        Guarda el resultado en CSV.
+        """
+        self.csv_handler.save_result(patient_id, label, prob)
+
+    def generate_pdf(self, x: int, y: int, w: int, h: int, report_id: int) -> str:
+        """
+        Genera PDF de la ventana Tkinter.
+        """
+        if self._pdf_generator is None:
+            from src.neumonia.pdf_generator import PDFGenerator
+            self._pdf_generator = PDFGenerator(config_path=self.config_path)
+        return self._pdf_generator.create_pdf(x, y, w, h, report_id)
+
+    def close(self):
+        """
+        Detiene el proceso de inferencia y elimina los buffers compartidos.
+        """
+        if self._process.is_alive():
+            self._conn.send(None)
+            self._process.join(timeout=10)
+        self._conn.close()
+        if self._image is not None:
+            self._image.unlink()
+            self._image = None
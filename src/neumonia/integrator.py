@@ -6,19 +6,42 @@ por la UI. Separa responsabilidades y encapsula la lógica de negocio.
 """
 
 import os
+import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 from PIL import Image
 import numpy as np
 import pydicom as dicom
 import cv2
 
 # Importar módulos funcionales
-from src.neumonia.load_model import ModelLoader
+from src.neumonia.load_model import NORMAL_INDEX, ModelLoader, ModelWatcher
 from src.neumonia.pre_processor import PreProcessor
-from src.neumonia.grad_cam import GradCAMModel
+from src.neumonia.grad_cam import GradCAMModel, LazyHeatmap
 from src.neumonia.csv_handler import CSVHandler
 from src.neumonia.pdf_generator import PDFGenerator
+from src.neumonia.result import PredictionResult, StudyResult
+from src.neumonia.async_api import AsyncBatcher
+from src.neumonia.preview_cache import PreviewCache
+from src.neumonia.resources import current_rss_bytes, trim_heap
+from src.neumonia.screening import ScreeningModel
+from src.neumonia.shadow import ShadowScorer
+
+
+class _Engine(NamedTuple):
+    """
+    Modelo activo y todo lo que depende de él; se reemplaza completo.
+    """
+
+    model: object
+    gradcam: GradCAMModel
+    screening: Optional[ScreeningModel]
+    # SHA-256 del archivo del modelo
+    version: str
 
 
 class Integrator:
@@ -26,29 +49,605 @@ class Integrator:
     Clase integradora que expone funcionalidades para la interfaz gráfica.
     """
 
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json", hot_reload: Optional[bool] = None,
+                 reload_interval: Optional[float] = None, tta_threshold: Optional[float] = None,
+                 max_rss_mb: Optional[float] = None, cascade_threshold: Optional[float] = None):
         """
         Inicializa el integrador con la configuración general.
+
+        Parameters
+        ----------
+        config_path : str, optional
+            Ruta al archivo de configuración JSON (por defecto "config.json").
+        hot_reload : bool, optional
+            Si es True, un :class:`ModelWatcher` recarga el modelo en segundo
+            plano cuando cambia ``model_path`` o el archivo del modelo.
+            Por defecto se toma la clave ``hot_reload`` de la configuración.
+        reload_interval : float, optional
+            Segundos entre revisiones de la recarga en caliente. Por defecto
+            se toma la clave ``reload_interval`` de la configuración (5.0).
+        tta_threshold : float, optional
+            Si la probabilidad más alta (en [0, 1]) queda por debajo de este
+            umbral, se aplica test-time augmentation en :meth:`predict_batch`.
+            Por defecto se toma la clave ``tta_threshold`` de la
+            configuración; sin ella, la augmentation está desactivada.
+        max_rss_mb : float, optional
+            Presupuesto de memoria residente en MB. Cada
+            ``memory_check_interval`` imágenes (clave de la configuración,
+            100 por defecto) se compara con el RSS del proceso y, si lo
+            supera, se ejecuta :meth:`release_memory`. Por defecto se toma
+            la clave ``max_rss_mb``; sin ella no se vigila la memoria.
+        cascade_threshold : float, optional
+            Activa la cascada de tamizaje en :meth:`predict_preprocessed`:
+            un modelo barato (:class:`ScreeningModel`) evalúa primero el
+            lote, los estudios con probabilidad de "normal" mayor o igual
+            al umbral se resuelven ahí, sin Grad-CAM, y el resto pasa al
+            modelo completo. Por defecto se toma la clave
+            ``cascade_threshold``; sin ella la cascada está desactivada. El
+            modelo de tamizaje es ``screening_model_path`` si está en la
+            configuración o, si no, la variante cuantizada del modelo
+            principal.
+
+        Notes
+        -----
+        Con la clave ``shadow_models`` (nombre -> ruta de un modelo
+        candidato) cada lote de :meth:`predict_preprocessed` o
+        :meth:`predict_batch` se evalúa también con los candidatos en
+        segundo plano (:class:`ShadowScorer`), y las probabilidades finales
+        (con test-time augmentation si se aplicó) y las latencias se guardan
+        en ``shadow_db_path``.
+
+        Las claves ``session_intra_op_threads`` y ``session_inter_op_threads``
+        fijan los hilos de TensorFlow de este proceso. Solo tienen efecto si
+        el integrador se crea antes de que TensorFlow ejecute operaciones.
         """
+        with open(config_path, "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+        if hot_reload is None:
+            hot_reload = self.config.get("hot_reload", False)
+        if reload_interval is None:
+            reload_interval = self.config.get("reload_interval", 5.0)
+        if tta_threshold is None:
+            tta_threshold = self.config.get("tta_threshold")
+        self.tta_threshold = tta_threshold
+        if max_rss_mb is None:
+            max_rss_mb = self.config.get("max_rss_mb")
+        self.max_rss_mb = max_rss_mb
+        if cascade_threshold is None:
+            cascade_threshold = self.config.get("cascade_threshold")
+        self.cascade_threshold = cascade_threshold
+        # Serializa los reemplazos del motor (recarga, liberación de memoria
+        # y tamizaje creado a demanda)
+        self._engine_lock = threading.RLock()
+        self.memory_check_interval = self.config.get("memory_check_interval", 100)
+        self.memory_releases = 0
+        self._memory_cond = threading.Condition()
+        self._inflight = 0
+        self._releasing = False
+        self._since_check = 0
+
+        ModelLoader.configure_threads(
+            self.config.get("session_intra_op_threads"),
+            self.config.get("session_inter_op_threads"),
+        )
+
         # Instancias de módulos funcionales
-        self.model_loader = ModelLoader()
+        self.model_loader = ModelLoader(config_file=config_path)
         self.preprocessor = PreProcessor()
-        self.model = self.model_loader.load_model()
-        self.gradcam = GradCAMModel(self.model)
+        self._set_model(self.model_loader.load_model(), self.model_loader.model_version)
         self.csv_handler = CSVHandler(config_path=config_path)
         self.pdf_generator = PDFGenerator(config_path=config_path)
 
+        self._batcher = None
+        self.preview_cache = PreviewCache(
+            os.path.join(self.config.get("cache_path", "outputs/cache"), "previews")
+        )
+        self.shadow = None
+        if self.config.get("shadow_models"):
+            self.shadow = ShadowScorer(
+                self.config["shadow_models"],
+                self.config.get("shadow_db_path", "outputs/index/studies.sqlite"),
+                queue_size=self.config.get("shadow_queue_size", 16),
+                guard=self._inference,
+            )
+            self.shadow.start()
+        self.watcher = None
+        if hot_reload:
+            self.watcher = ModelWatcher(
+                self.model_loader, interval=reload_interval, on_reload=self._set_model,
+                guard=self._inference,
+            )
+            self.watcher.start()
+
+    def _set_model(self, model, model_version: str,
+                   screening: Optional[ScreeningModel] = None):
+        """
+        Reemplaza de forma atómica el modelo, su versión, su Grad-CAM
+        asociado y, con la cascada activa, el modelo de tamizaje.
+
+        El Grad-CAM y el tamizaje se construyen y se calientan antes del
+        reemplazo; en una recarga en caliente esto ocurre en el hilo de
+        :class:`ModelWatcher` antes de registrar el modelo en
+        :class:`ModelLoader`, de modo que ninguna solicitud paga ese costo
+        y, si algo falla, el motor anterior sigue activo.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            Modelo principal.
+        model_version : str
+            Versión (SHA-256) del modelo.
+        screening : ScreeningModel, optional
+            Modelo de tamizaje a conservar; por defecto se construye con
+            :meth:`_load_screening` si ``cascade_threshold`` está definido.
+        """
+        with self._engine_lock:
+            gradcam = GradCAMModel(model)
+            gradcam.warm_up()
+            if screening is None and self.cascade_threshold is not None:
+                screening = self._load_screening(model, model_version)
+            self._engine = _Engine(model, gradcam, screening, model_version)
+
+    def _load_screening(self, model, model_version: str) -> ScreeningModel:
+        """
+        Construye el modelo de tamizaje para ``model``.
+
+        Un ``screening_model_path`` no depende del modelo principal y se
+        reutiliza si ya está cargado; si no, se usa la variante cuantizada de
+        ``model``, guardada en la caché por versión.
+        """
+        path = self.config.get("screening_model_path")
+        if path is not None:
+            current = getattr(self, "_engine", None)
+            if current is not None and current.screening is not None:
+                return current.screening
+            return ScreeningModel.load(path)
+        return ScreeningModel.quantize(
+            model,
+            cache_dir=os.path.join(self.config.get("cache_path", "outputs/cache"), "screening"),
+            version=model_version,
+        )
+
+    @property
+    def model(self):
+        """
+        Modelo activo.
+        """
+        return self._engine.model
+
+    @property
+    def gradcam(self) -> GradCAMModel:
+        """
+        Generador de Grad-CAM asociado al modelo activo.
+        """
+        return self._engine.gradcam
+
+    @property
+    def model_version(self) -> str:
+        """
+        Versión (SHA-256) del modelo activo, la que identifica sus
+        resultados.
+        """
+        return self._engine.version
+
+    @property
+    def screening(self) -> ScreeningModel:
+        """
+        Modelo de tamizaje de la cascada, asociado al modelo activo.
+
+        Se construye junto con el modelo (:meth:`_set_model`); solo se crea
+        aquí si la cascada se activó después de crear el integrador.
+        """
+        engine = self._engine
+        if engine.screening is None:
+            with self._engine_lock:
+                engine = self._engine
+                if engine.screening is None:
+                    engine = engine._replace(
+                        screening=self._load_screening(engine.model, engine.version)
+                    )
+                    self._engine = engine
+        return engine.screening
+
+    @contextmanager
+    def _inference(self):
+        """
+        Marca una ejecución del modelo en curso; espera si se está liberando
+        memoria.
+        """
+        with self._memory_cond:
+            self._memory_cond.wait_for(lambda: not self._releasing)
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._memory_cond:
+                self._inflight -= 1
+                self._memory_cond.notify_all()
+
+    def _check_memory(self, count: int):
+        """
+        Cuenta ``count`` imágenes procesadas y, cada
+        ``memory_check_interval``, libera memoria si el RSS supera
+        ``max_rss_mb``.
+        """
+        if self.max_rss_mb is None:
+            return
+        with self._memory_cond:
+            self._since_check += count
+            if self._since_check < self.memory_check_interval:
+                return
+            self._since_check = 0
+        if current_rss_bytes() > self.max_rss_mb * 2 ** 20:
+            self.release_memory()
+
+    def release_memory(self) -> bool:
+        """
+        Libera la memoria acumulada por TensorFlow y Keras sin descargar el
+        modelo.
+
+        Se limpia la sesión de Keras (:meth:`ModelLoader.release_session`),
+        se reconstruye el Grad-CAM del modelo activo (conservando el modelo
+        de tamizaje) y se devuelve al sistema
+        la memoria libre del heap. Solo se ejecuta si no hay predicciones ni
+        una recarga en caliente en curso; las nuevas esperan a que termine.
+
+        Returns
+        -------
+        bool
+            True si se liberó memoria, False si se pospuso porque había
+            predicciones o una recarga en curso.
+        """
+        with self._memory_cond:
+            if self._inflight or self._releasing:
+                return False
+            self._releasing = True
+        try:
+            # Con el lock tomado ninguna recarga reemplaza el motor a mitad
+            # de camino; la recarga, además, corre dentro de _inference
+            with self._engine_lock:
+                engine = self._engine
+                ModelLoader.release_session()
+                self._set_model(engine.model, engine.version, engine.screening)
+            trim_heap()
+            self.memory_releases += 1
+        finally:
+            with self._memory_cond:
+                self._releasing = False
+                self._memory_cond.notify_all()
+        return True
+
+    def close(self):
+        """
+        Detiene la recarga en caliente, la fachada asíncrona y el modo sombra
+        si están activos.
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+        if self.shadow is not None:
+            self.shadow.stop()
+            self.shadow = None
+
+    async def aprocess(self, source, patient_id: str = "",
+                       timeout: Optional[float] = None) -> PredictionResult:
+        """
+        Versión asíncrona de :meth:`predict` que no bloquea el event loop.
+
+        La lectura y el preprocesamiento se ejecutan en un pool de hilos, y
+        las solicitudes concurrentes se agrupan en lotes que comparten una
+        pasada del modelo. El tamaño del pool y del lote se toman de las
+        claves ``io_workers``, ``async_max_batch`` y ``async_max_delay`` de
+        la configuración.
+
+        Parameters
+        ----------
+        source : str, bytes, memoryview or np.ndarray
+            Ruta al DICOM, su contenido en memoria o la imagen ya cargada.
+        patient_id : str, optional
+            Identificador del paciente.
+        timeout : float, optional
+            Segundos máximos de espera; al vencer se cancela la solicitud.
+
+        Returns
+        -------
+        PredictionResult
+            Resultado de la predicción.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            Si se supera ``timeout``.
+        """
+        if self._batcher is None:
+            self._batcher = AsyncBatcher(
+                self,
+                max_batch_size=self.config.get("async_max_batch", 8),
+                max_delay=self.config.get("async_max_delay", 0.005),
+                io_workers=self.config.get("io_workers"),
+            )
+        return await asyncio.wait_for(self._batcher.process(source, patient_id), timeout)
+
     def load_image(self, path: str):
         """
         Carga imagen DICOM y devuelve array y PIL.Image.
         Parameters
         ----------
-        path : str
-            Ruta al archivo de imagen.
+        path : str, bytes, memoryview o archivo
+            Ruta al archivo de imagen o su contenido en memoria.
         """
         return self.preprocessor.read_dicom(path)
 
-    def process_image_from_array(self, array: np.ndarray, patient_id: str) -> Tuple[str, float, np.ndarray]:
+    def load_preview(self, path: str) -> Tuple[Image.Image, Optional[np.ndarray]]:
+        """
+        Devuelve la vista previa de 250x250 para la interfaz.
+
+        Si está en la caché no se decodifica la imagen; si no, se decodifica,
+        se genera la vista previa y se guarda, y se devuelve también la
+        imagen completa para no leerla dos veces.
+
+        Parameters
+        ----------
+        path : str
+            Ruta al archivo DICOM.
+
+        Returns
+        -------
+        preview : PIL.Image.Image
+            Vista previa.
+        array : np.ndarray or None
+            Imagen completa si hubo que decodificarla, o None.
+        """
+        preview = self.preview_cache.get(path)
+        if preview is not None:
+            return preview, None
+        array, _ = self.load_image(path)
+        return self.preview_cache.put(path, array), array
+
+    def predict(self, array: np.ndarray, patient_id: str = "") -> PredictionResult:
+        """
+        Preprocesa, predice y calcula el Grad-CAM crudo de una imagen.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Imagen ya cargada en memoria.
+        patient_id : str, optional
+            Identificador del paciente.
+
+        Returns
+        -------
+        PredictionResult
+            Resultado compacto; la superposición se genera con
+            :meth:`PredictionResult.render_overlay`.
+        """
+        return self.predict_batch([array], [patient_id])[0]
+
+    def predict_batch(self, arrays: Sequence[np.ndarray],
+                      patient_ids: Optional[Sequence[str]] = None,
+                      cascade: Optional[bool] = None) -> List[PredictionResult]:
+        """
+        Procesa varias imágenes en una sola pasada del modelo.
+
+        Parameters
+        ----------
+        arrays : sequence of np.ndarray
+            Imágenes ya cargadas en memoria.
+        patient_ids : sequence of str, optional
+            Identificadores de los pacientes, en el mismo orden.
+        cascade : bool, optional
+            Ver :meth:`predict_preprocessed`.
+
+        Returns
+        -------
+        list of PredictionResult
+            Un resultado por imagen.
+        """
+        img_batch = np.concatenate([self.preprocessor.preprocess(a) for a in arrays])
+        start = time.perf_counter()
+        engine, results = self._predict(img_batch, patient_ids, cascade)
+        if self.tta_threshold is not None:
+            uncertain = [
+                i for i, r in enumerate(results)
+                if not r.screened and r.probabilities[r.label_index] < self.tta_threshold
+            ]
+            if uncertain:
+                self._apply_tta(engine, [arrays[i] for i in uncertain],
+                                [results[i] for i in uncertain])
+        # El modo sombra registra las probabilidades finales, después de la TTA
+        self._submit_shadow(engine, img_batch, results, time.perf_counter() - start)
+        return results
+
+    def _apply_tta(self, engine: _Engine, arrays: Sequence[np.ndarray],
+                   results: Sequence[PredictionResult]):
+        """
+        Promedia las probabilidades de cada resultado con las de sus vistas
+        aumentadas (:meth:`PreProcessor.augment`).
+
+        Las vistas de todos los estudios se evalúan en una sola pasada del
+        modelo. El Grad-CAM se conserva el de la imagen original.
+        """
+        views = [self.preprocessor.augment(a) for a in arrays]
+        with self._inference():
+            preds = engine.model.predict(np.concatenate(views), verbose=0)
+        start = 0
+        for result, view in zip(results, views):
+            view_preds = preds[start:start + len(view)]
+            start += len(view)
+            probabilities = (result.probabilities + view_preds.sum(axis=0)) / (len(view) + 1)
+            result.probabilities = probabilities.astype(np.float32)
+            result.label_index = int(np.argmax(result.probabilities))
+            result.views = len(view) + 1
+
+    def predict_preprocessed(self, img_batch: np.ndarray,
+                             patient_ids: Optional[Sequence[str]] = None,
+                             cascade: Optional[bool] = None) -> List[PredictionResult]:
+        """
+        Predice y calcula el Grad-CAM crudo de un lote ya preprocesado.
+
+        Parameters
+        ----------
+        img_batch : np.ndarray
+            Lote con shape (N, 512, 512, 1) generado por
+            :meth:`PreProcessor.preprocess`.
+        patient_ids : sequence of str, optional
+            Identificadores de los pacientes, en el mismo orden.
+        cascade : bool, optional
+            Si es True, los estudios que el modelo de tamizaje clasifica como
+            normales con probabilidad de al menos ``cascade_threshold`` se
+            resuelven sin el modelo completo ni Grad-CAM
+            (``screened=True``). Por defecto se usa la cascada si
+            ``cascade_threshold`` está definido.
+
+        Returns
+        -------
+        list of PredictionResult
+            Un resultado por imagen del lote.
+        """
+        start = time.perf_counter()
+        engine, results = self._predict(img_batch, patient_ids, cascade)
+        self._submit_shadow(engine, img_batch, results, time.perf_counter() - start)
+        return results
+
+    def _predict(self, img_batch: np.ndarray, patient_ids: Optional[Sequence[str]],
+                 cascade: Optional[bool]) -> Tuple[_Engine, List[PredictionResult]]:
+        """
+        :meth:`predict_preprocessed` sin registrar el lote en el modo sombra.
+
+        Toda la solicitud usa el mismo motor, que se devuelve junto con los
+        resultados: una recarga en caliente no la afecta.
+        """
+        if patient_ids is None:
+            patient_ids = [""] * len(img_batch)
+        if cascade is None:
+            cascade = self.cascade_threshold is not None
+        if cascade:
+            # Construye el tamizaje si la cascada se activó después
+            self.screening
+            engine = self._engine
+            return engine, self._predict_cascade(engine, img_batch, patient_ids)
+        engine = self._engine
+        return engine, self._predict_full(engine, img_batch, patient_ids)
+
+    def _submit_shadow(self, engine: _Engine, img_batch: np.ndarray,
+                       results: Sequence[PredictionResult], latency: float):
+        """
+        Encola el lote y sus resultados finales en el modo sombra, si está
+        activo, para que los candidatos lo evalúen en segundo plano.
+        """
+        if self.shadow is None:
+            return
+        screening = engine.screening
+        self.shadow.submit(img_batch, results, latency, engine.version,
+                           None if screening is None else screening.version)
+
+    def _predict_full(self, engine: _Engine, img_batch: np.ndarray,
+                      patient_ids: Sequence[str]) -> List[PredictionResult]:
+        """
+        Evalúa el lote con el modelo completo y calcula su Grad-CAM.
+        """
+        # Predecir y calcular el Grad-CAM crudo en una sola pasada
+        with self._inference():
+            cams, preds = engine.gradcam.compute_cam(img_batch)
+        self._check_memory(len(img_batch))
+        return [
+            PredictionResult.from_outputs(p, c, pid)
+            for p, c, pid in zip(preds, cams, patient_ids)
+        ]
+
+    def _predict_cascade(self, engine: _Engine, img_batch: np.ndarray,
+                         patient_ids: Sequence[str]) -> List[PredictionResult]:
+        """
+        Evalúa el lote con el modelo de tamizaje y escala al modelo completo
+        solo los estudios que no son claramente normales.
+        """
+        with self._inference():
+            preds = engine.screening.predict(img_batch)
+        cleared = ((preds.argmax(axis=1) == NORMAL_INDEX)
+                   & (preds[:, NORMAL_INDEX] >= self.cascade_threshold))
+        results: List[Optional[PredictionResult]] = [None] * len(img_batch)
+        for i in np.flatnonzero(cleared):
+            results[i] = PredictionResult(
+                label_index=NORMAL_INDEX, probabilities=preds[i], cam=None,
+                patient_id=patient_ids[i], screened=True,
+            )
+        escalated = np.flatnonzero(~cleared)
+        if len(escalated):
+            full = self._predict_full(engine, img_batch[escalated],
+                                      [patient_ids[i] for i in escalated])
+            for i, result in zip(escalated, full):
+                results[i] = result
+        self._check_memory(int(cleared.sum()))
+        return results
+
+    def process_study(self, source, patient_id: str = "", batch_size: int = 8) -> StudyResult:
+        """
+        Evalúa un estudio completo: todos los frames de uno o varios DICOM
+        (por ejemplo una carpeta con varias series) y agrega sus probabilidades.
+
+        Los frames se decodifican de a uno y se evalúan en lotes de
+        ``batch_size``, así que la memoria no depende del número de frames.
+
+        Parameters
+        ----------
+        source : str or sequence of str
+            Archivo DICOM (de uno o varios frames), carpeta (se recorre
+            recursivamente buscando ``*.dcm``) o lista de archivos.
+        patient_id : str, optional
+            Identificador del paciente.
+        batch_size : int, optional
+            Frames por pasada del modelo (por defecto 8).
+
+        Returns
+        -------
+        StudyResult
+            Probabilidades promedio del estudio, por serie y por frame.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            source = Path(source)
+            paths = sorted(source.glob("**/*.dcm")) if source.is_dir() else [source]
+        else:
+            paths = [Path(p) for p in source]
+
+        frames: List[PredictionResult] = []
+        frame_series: List[str] = []
+        pending, pending_ids = [], []
+
+        def flush():
+            if pending:
+                frames.extend(self.predict_preprocessed(np.concatenate(pending), pending_ids))
+                pending.clear()
+                pending_ids.clear()
+
+        for path in paths:
+            series_uid = self.preprocessor.read_header(path)["SeriesInstanceUID"] or str(path)
+            for index, frame in enumerate(self.preprocessor.iter_frames(path)):
+                pending.append(self.preprocessor.preprocess(frame))
+                pending_ids.append(f"{path}#{index}")
+                frame_series.append(series_uid)
+                if len(pending) == batch_size:
+                    flush()
+        flush()
+        if not frames:
+            raise ValueError(f"No se encontraron imágenes DICOM en {source}")
+
+        probabilities = np.stack([f.probabilities for f in frames])
+        series = {
+            uid: probabilities[[s == uid for s in frame_series]].mean(axis=0)
+            for uid in dict.fromkeys(frame_series)
+        }
+        return StudyResult(
+            patient_id=patient_id,
+            probabilities=probabilities.mean(axis=0),
+            frames=frames,
+            series=series,
+        )
+
+    def process_image_from_array(self, array: np.ndarray, patient_id: str,
+                                 lazy_heatmap: bool = False) -> Tuple[str, float, np.ndarray]:
         """
         Procesa una imagen ya cargada como array: preprocesa, predice y genera Grad-CAM.
 
@@ -58,6 +657,9 @@ class Integrator:
             Imagen ya cargada en memoria.
         patient_id : str
             Identificador del paciente.
+        lazy_heatmap : bool, optional
+            Si es True, se devuelve un :class:`LazyHeatmap` que solo colorea
+            y superpone el Grad-CAM cuando se visualiza (por defecto False).
 
         Returns
         -------
@@ -65,24 +667,15 @@ class Integrator:
             Etiqueta predicha ('bacteriana', 'viral', 'normal').
         prob : float
             Probabilidad de la predicción (%).
-        heatmap_array : np.ndarray
+        heatmap_array : np.ndarray or LazyHeatmap
             Imagen con Grad-CAM superpuesto.
         """
-        # Preprocesar
-        img_batch = self.preprocessor.preprocess(array)
-
-        # Predecir
-        preds = self.model.predict(img_batch, verbose=0)
-        pred_class = int(np.argmax(preds[0]))
-        prob = float(np.max(preds[0]) * 100)
-
-        label_map = {0: "bacteriana", 1: "normal", 2: "viral"}
-        label = label_map.get(pred_class, "desconocida")
-
-        # Generar Grad-CAM
-        heatmap_array = self.gradcam.grad_cam(img_batch,array)
-
-        return label, prob, heatmap_array
+        # La interfaz siempre muestra el Grad-CAM: sin cascada
+        result = self.predict_batch([array], [patient_id], cascade=False)[0]
+        heatmap = LazyHeatmap(result.cam, array)
+        if lazy_heatmap:
+            return result.label, result.prob, heatmap
+        return result.label, result.prob, heatmap.render()
 
     def save_result(self, patient_id: str, label: str, prob: float):
         """
@@ -4,17 +4,37 @@
 Módulo para cargar un modelo de red neuronal convolucional previamente
 entrenado usando el patrón Singleton. La ruta del modelo se obtiene
 desde un archivo de configuración JSON.
+
+Incluye además :class:`ModelWatcher`, un hilo que vigila el archivo de
+configuración y el archivo del modelo para recargarlo en caliente sin
+reiniciar la aplicación.
 """
 
 import os
 import json
+import hashlib
+import warnings
+import threading
+import contextlib
+from typing import Callable, ContextManager, List, Optional
+
+import numpy as np
 import tensorflow as tf
 
 
+# Índice de salida del modelo -> etiqueta de la clase
+LABEL_MAP = {0: "bacteriana", 1: "normal", 2: "viral"}
+# Índice de la clase "normal", la que la cascada de tamizaje puede descartar
+NORMAL_INDEX = next(i for i, label in LABEL_MAP.items() if label == "normal")
+
+
 class ModelLoader:
     """
     Clase Singleton encargada de cargar y mantener una única instancia
     del modelo de red neuronal convolucional.
+
+    El atributo ``model_version`` guarda el SHA-256 del archivo del modelo
+    cargado, para identificar con qué modelo se obtuvo cada resultado.
     """
 
     _instance = None
@@ -29,6 +49,9 @@ class ModelLoader:
             cls._instance = super(ModelLoader, cls).__new__(cls)
             cls._instance.config_file = config_file
             cls._instance.model_path = cls._instance._read_config()
+            cls._instance._lock = threading.Lock()
+            cls._instance._model_stamp = None
+            cls._instance.model_version = None
         return cls._instance
 
     def _read_config(self) -> str:
@@ -55,6 +78,112 @@ class ModelLoader:
 
         return config["model_path"]
 
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[tuple]:
+        """
+        Devuelve una marca (mtime, tamaño) del archivo, o None si no existe.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+        """
+        Calcula el SHA-256 del contenido de un archivo.
+
+        Args:
+            path (str): Ruta del archivo.
+            chunk_size (int): Bytes leídos por iteración.
+
+        Returns:
+            str: Hash en hexadecimal.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _read_model(model_path: str) -> tf.keras.Model:
+        """
+        Lee el modelo desde disco.
+
+        Raises:
+            FileNotFoundError: Si el archivo del modelo no existe.
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"No se encontró el archivo del modelo: {model_path}"
+            )
+        return tf.keras.models.load_model(model_path, compile=False)
+
+    @staticmethod
+    def configure_threads(intra_op_threads: Optional[int] = None,
+                          inter_op_threads: Optional[int] = None) -> bool:
+        """
+        Fija los hilos de TensorFlow del proceso (intra-op e inter-op).
+
+        Solo tiene efecto antes de que TensorFlow ejecute su primera
+        operación; si ya está inicializado con otros valores se emite un
+        aviso y se conservan los actuales. Un valor None o 0 deja el
+        predeterminado de TensorFlow.
+
+        Args:
+            intra_op_threads (int, optional): Hilos dentro de cada operación.
+            inter_op_threads (int, optional): Operaciones en paralelo.
+
+        Returns:
+            bool: True si los valores pedidos quedaron aplicados.
+        """
+        applied = True
+        settings = (
+            ("intra_op", intra_op_threads, tf.config.threading.get_intra_op_parallelism_threads,
+             tf.config.threading.set_intra_op_parallelism_threads),
+            ("inter_op", inter_op_threads, tf.config.threading.get_inter_op_parallelism_threads,
+             tf.config.threading.set_inter_op_parallelism_threads),
+        )
+        for name, value, getter, setter in settings:
+            if not value or getter() == value:
+                continue
+            try:
+                setter(value)
+            except RuntimeError:
+                warnings.warn(
+                    f"TensorFlow ya está inicializado; no se pudo fijar {name}={value}.",
+                    RuntimeWarning,
+                )
+                applied = False
+        return applied
+
+    @staticmethod
+    def release_session() -> None:
+        """
+        Libera el estado global de Keras y la caché de kernels de
+        TensorFlow.
+
+        Los modelos ya cargados siguen funcionando; solo se pierden los
+        objetos auxiliares (grafos, nombres de capas, kernels compilados),
+        que se reconstruyen al usarse. No debe llamarse mientras otro hilo
+        ejecuta el modelo.
+        """
+        tf.keras.backend.clear_session(free_memory=True)
+
+    @staticmethod
+    def warm_up(model: tf.keras.Model) -> None:
+        """
+        Ejecuta una predicción con un tensor de ceros para que TensorFlow
+        construya el grafo antes de atender solicitudes reales.
+
+        Args:
+            model (tf.keras.Model): Modelo a calentar.
+        """
+        shape = [1 if dim is None else dim for dim in model.inputs[0].shape]
+        model.predict(np.zeros(shape, dtype=np.float32), verbose=0)
+
     def load_model(self) -> tf.keras.Model:
         """
         Carga el modelo desde archivo si aún no está cargado.
@@ -64,11 +193,161 @@ class ModelLoader:
             tf.keras.Model: Modelo cargado.
         """
         if self._model is None:
-            if not os.path.exists(self.model_path):
-                raise FileNotFoundError(
-                    f"No se encontró el archivo del modelo: {self.model_path}"
-                )
-            self._model = tf.keras.models.load_model(
-                self.model_path, compile=False
-            )
+            with self._lock:
+                if self._model is None:
+                    model = self._read_model(self.model_path)
+                    self._model_stamp = self._file_stamp(self.model_path)
+                    self.model_version = self.file_hash(self.model_path)
+                    ModelLoader._model = model
         return self._model
+
+    def has_changed(self) -> bool:
+        """
+        Indica si la ruta del modelo en la configuración o el archivo
+        del modelo han cambiado desde la última carga.
+
+        Returns:
+            bool: True si es necesario recargar el modelo.
+        """
+        try:
+            model_path = self._read_config()
+        except (OSError, KeyError, ValueError):
+            # Configuración a medio escribir: se reintenta en el siguiente ciclo
+            return False
+        if model_path != self.model_path:
+            return True
+        stamp = self._file_stamp(model_path)
+        return stamp is not None and stamp != self._model_stamp
+
+    def prepare_reload(self) -> tuple:
+        """
+        Carga y calienta el modelo indicado en la configuración sin
+        reemplazar al actual.
+
+        Returns:
+            tuple: (modelo, ruta, marca del archivo, versión) para
+            :meth:`commit_reload`.
+
+        Raises:
+            FileNotFoundError: Si el nuevo archivo del modelo no existe.
+        """
+        model_path = self._read_config()
+        stamp = self._file_stamp(model_path)
+        model = self._read_model(model_path)
+        model_version = self.file_hash(model_path)
+        self.warm_up(model)
+        return model, model_path, stamp, model_version
+
+    def commit_reload(self, model: tf.keras.Model, model_path: str, stamp: Optional[tuple],
+                      model_version: str) -> None:
+        """
+        Registra como actual un modelo preparado con :meth:`prepare_reload`.
+        """
+        with self._lock:
+            self.model_path = model_path
+            self._model_stamp = stamp
+            self.model_version = model_version
+            ModelLoader._model = model
+
+    def reload_model(self) -> tf.keras.Model:
+        """
+        Carga y calienta el modelo indicado en la configuración y lo
+        intercambia de forma atómica por el actual.
+
+        El modelo anterior no se destruye: las solicitudes en curso que
+        ya tomaron una referencia a él terminan con normalidad.
+
+        Returns:
+            tf.keras.Model: Nuevo modelo cargado.
+
+        Raises:
+            FileNotFoundError: Si el nuevo archivo del modelo no existe.
+        """
+        candidate = self.prepare_reload()
+        self.commit_reload(*candidate)
+        return candidate[0]
+
+
+class ModelWatcher(threading.Thread):
+    """
+    Hilo en segundo plano que recarga el modelo cuando cambia
+    ``model_path`` en la configuración o el archivo del modelo.
+
+    Parameters
+    ----------
+    loader : ModelLoader
+        Cargador cuyo modelo se vigila.
+    interval : float, optional
+        Segundos entre revisiones (por defecto 5.0).
+    on_reload : callable, optional
+        Función invocada con el nuevo modelo y su versión, ya calentado,
+        antes de registrarlo en ``loader``; por ejemplo, para construir y
+        activar todo lo que depende del modelo. Si falla, la recarga se
+        descarta como si el modelo no se hubiera podido cargar.
+    guard : callable, optional
+        Fábrica de un context manager que envuelve la carga, el
+        calentamiento y ``on_reload``, por ejemplo ``Integrator._inference``
+        para que :meth:`Integrator.release_memory` no limpie la sesión
+        mientras tanto.
+
+    Notes
+    -----
+    Los errores de cada recarga se guardan en ``errors`` y el hilo sigue
+    vigilando. Un mismo archivo rechazado no se vuelve a intentar hasta que
+    cambie.
+    """
+
+    def __init__(self, loader: ModelLoader, interval: float = 5.0,
+                 on_reload: Optional[Callable[[tf.keras.Model, str], None]] = None,
+                 guard: Optional[Callable[[], ContextManager]] = None):
+        super().__init__(name="ModelWatcher", daemon=True)
+        self.loader = loader
+        self.interval = interval
+        self.on_reload = on_reload
+        self.guard = guard or contextlib.nullcontext
+        self.errors: List[Exception] = []
+        # (ruta, marca) del último modelo rechazado
+        self._rejected = None
+        self._stop_event = threading.Event()
+
+    def check(self) -> bool:
+        """
+        Revisa una vez si hay cambios y, de haberlos, recarga el modelo.
+
+        Returns
+        -------
+        bool
+            True si se recargó el modelo.
+        """
+        if not self.loader.has_changed():
+            return False
+        try:
+            model_path = self.loader._read_config()
+        except (OSError, KeyError, ValueError):
+            return False
+        key = (model_path, ModelLoader._file_stamp(model_path))
+        if key == self._rejected:
+            return False
+        try:
+            with self.guard():
+                candidate = self.loader.prepare_reload()
+                if self.on_reload is not None:
+                    self.on_reload(candidate[0], candidate[3])
+        except Exception as exc:
+            # Se conserva el modelo anterior si el nuevo no se puede cargar
+            # o no sirve (por ejemplo, le falta la capa del Grad-CAM)
+            self.errors.append(exc)
+            self._rejected = key
+            return False
+        self.loader.commit_reload(*candidate)
+        return True
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """
+        Detiene el hilo de vigilancia.
+        """
+        self._stop_event.set()
@@ -1,7 +1,6 @@
 import os
 import json
 from pathlib import Path
-import pyautogui
 from PIL import Image
 
 
@@ -70,6 +69,9 @@ class PDFGenerator:
         - Se genera primero una imagen JPG temporal antes de convertirla en PDF.
         - El archivo resultante se guarda en la carpeta definida por ``pdf_path`` en el JSON.
         """
+        # Importación diferida: pyautogui requiere un servidor gráfico al
+        # importarse, y el resto del paquete debe poder usarse sin él
+        import pyautogui
 
         screenshot = pyautogui.screenshot(region=(x, y, w, h))
         img_path = self.pdf_path / f"Reporte{report_id}.jpg"
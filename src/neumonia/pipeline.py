@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pipeline de procesamiento en flujo continuo.
+
+Encadena las etapas existentes (lectura DICOM, preprocesamiento, predicción
+con Grad-CAM y guardado en CSV) en hilos separados, unidos por colas
+acotadas. Si una etapa se atrasa, las anteriores se bloquean, de modo que la
+memoria usada no depende del tamaño de la entrada.
+
+La entrada puede ser cualquier iterable, incluso infinito, de rutas, buffers
+de bytes o pares ``(patient_id, origen)``; por ejemplo :func:`watch_directory`.
+"""
+
+import os
+import time
+import queue
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.result import PredictionResult
+
+# Marca de fin de flujo entre etapas
+_END = object()
+
+
+class _Failure:
+    """
+    Error ocurrido en una etapa, transportado hasta el consumidor.
+    """
+
+    __slots__ = ("patient_id", "error")
+
+    def __init__(self, patient_id: str, error: Exception):
+        self.patient_id = patient_id
+        self.error = error
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Inserta en una cola acotada esperando espacio, salvo que se detenga
+    el pipeline. Devuelve False si se detuvo.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """
+    Extrae de una cola esperando un elemento, salvo que se detenga
+    el pipeline. Devuelve ``_END`` si se detuvo.
+    """
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _END
+
+
+class StreamingPipeline:
+    """
+    Procesa estudios a medida que llegan, con memoria acotada.
+
+    Parameters
+    ----------
+    integrator : Integrator
+        Integrador que aporta el modelo y el guardado en CSV.
+    queue_size : int, optional
+        Capacidad de cada cola entre etapas (por defecto 8).
+    batch_size : int, optional
+        Máximo de estudios ya preprocesados que se agrupan en una sola
+        pasada del modelo (por defecto 1). Nunca se espera a llenar el lote.
+    save_csv : bool, optional
+        Si es True, cada resultado se guarda con ``integrator.save_result``.
+    skip_errors : bool, optional
+        Si es True, los estudios que fallan se omiten y se registran en
+        ``errors``; si es False, el error se propaga al consumidor.
+
+    Examples
+    --------
+    >>> pipeline = StreamingPipeline(integrator, save_csv=True)
+    >>> for result in pipeline.run(watch_directory("data/entrantes")):
+    ...     print(result.patient_id, result.label, result.prob)
+    """
+
+    def __init__(self, integrator, queue_size: int = 8, batch_size: int = 1,
+                 save_csv: bool = False, skip_errors: bool = False):
+        self.integrator = integrator
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.save_csv = save_csv
+        self.skip_errors = skip_errors
+        self.errors: List[Tuple[str, Exception]] = []
+
+    @staticmethod
+    def _normalize(item, index: int) -> Tuple[str, object]:
+        """
+        Convierte un elemento de entrada en ``(patient_id, origen)``.
+
+        Las rutas usan el nombre del archivo como identificador y los
+        buffers de bytes su posición en el flujo.
+        """
+        if isinstance(item, tuple):
+            patient_id, source = item
+        elif isinstance(item, (str, os.PathLike)):
+            patient_id, source = Path(item).stem, item
+        else:
+            patient_id, source = str(index), item
+        return patient_id, source
+
+    def _read_stage(self, sources: Iterable, out: queue.Queue, stop: threading.Event):
+        """
+        Lee y preprocesa cada estudio.
+        """
+        try:
+            for index, item in enumerate(sources):
+                if stop.is_set():
+                    return
+                patient_id = str(index)
+                try:
+                    patient_id, source = self._normalize(item, index)
+                    array, _ = PreProcessor.read_dicom(source)
+                    payload = (patient_id, PreProcessor.preprocess(array))
+                except Exception as exc:
+                    payload = _Failure(patient_id, exc)
+                if not _put(out, payload, stop):
+                    return
+        except Exception as exc:
+            # Falla del propio iterable de entrada
+            _put(out, _Failure("", exc), stop)
+        _put(out, _END, stop)
+
+    def _infer_stage(self, inp: queue.Queue, out: queue.Queue, stop: threading.Event):
+        """
+        Agrupa los estudios disponibles y ejecuta el modelo con Grad-CAM.
+        """
+        finished = False
+        while not finished:
+            item = _get(inp, stop)
+            if item is _END:
+                break
+            pending = [item]
+            while len(pending) < self.batch_size:
+                try:
+                    item = inp.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                pending.append(item)
+
+            failures = [p for p in pending if isinstance(p, _Failure)]
+            ready = [p for p in pending if not isinstance(p, _Failure)]
+            outputs: list = list(failures)
+            if ready:
+                patient_ids = [pid for pid, _ in ready]
+                try:
+                    img_batch = np.concatenate([batch for _, batch in ready])
+                    outputs.extend(self.integrator.predict_preprocessed(img_batch, patient_ids))
+                except Exception as exc:
+                    outputs.extend(_Failure(pid, exc) for pid in patient_ids)
+            for output in outputs:
+                if not _put(out, output, stop):
+                    return
+        _put(out, _END, stop)
+
+    def run(self, sources: Iterable) -> Iterator[PredictionResult]:
+        """
+        Procesa los estudios del iterable a medida que se producen.
+
+        Parameters
+        ----------
+        sources : iterable
+            Rutas, buffers de bytes (``bytes``, ``bytearray``, ``memoryview``)
+            o pares ``(patient_id, origen)``.
+
+        Yields
+        ------
+        PredictionResult
+            Resultado de cada estudio, en el orden de llegada.
+
+        Raises
+        ------
+        Exception
+            El error del primer estudio que falle, si ``skip_errors`` es False.
+        """
+        stop = threading.Event()
+        decoded: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        scored: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(target=self._read_stage, args=(sources, decoded, stop),
+                             name="pipeline-read", daemon=True),
+            threading.Thread(target=self._infer_stage, args=(decoded, scored, stop),
+                             name="pipeline-infer", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = scored.get()
+                if item is _END:
+                    break
+                if isinstance(item, _Failure):
+                    if not self.skip_errors:
+                        raise item.error
+                    self.errors.append((item.patient_id, item.error))
+                    continue
+                if self.save_csv:
+                    self.integrator.save_result(item.patient_id, item.label, item.prob)
+                yield item
+        finally:
+            # También se ejecuta si el consumidor deja de iterar
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=1)
+
+
+def watch_directory(directory: str, pattern: str = "*.dcm", interval: float = 1.0,
+                    settle: float = 1.0, stop_event: Optional[threading.Event] = None) -> Iterator[str]:
+    """
+    Genera las rutas de los archivos nuevos que aparecen en una carpeta.
+
+    Parameters
+    ----------
+    directory : str
+        Carpeta vigilada.
+    pattern : str, optional
+        Patrón glob de los archivos (por defecto "*.dcm").
+    interval : float, optional
+        Segundos entre revisiones de la carpeta.
+    settle : float, optional
+        Segundos sin modificaciones antes de entregar un archivo, para no
+        leer archivos que aún se están escribiendo.
+    stop_event : threading.Event, optional
+        Evento que detiene la vigilancia; sin él, el generador es infinito.
+
+    Yields
+    ------
+    str
+        Ruta de cada archivo nuevo, una sola vez, por orden de modificación.
+    """
+    seen = set()
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        now = time.time()
+        ready = []
+        for path in Path(directory).glob(pattern):
+            key = str(path)
+            if key in seen:
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime >= settle:
+                ready.append((mtime, key))
+        for _, key in sorted(ready):
+            seen.add(key)
+            yield key
+        stop_event.wait(interval)
@@ -3,8 +3,9 @@
 Preprocesamiento de imágenes médicas.
 
 Esta clase proporciona métodos para:
-1. Leer imágenes desde archivos DICOM o JPG/PNG.
-2. Preprocesar imágenes para entrada en modelos CNN:
+1. Leer imágenes desde archivos DICOM o JPG/PNG, también desde bytes en memoria.
+2. Indexar carpetas leyendo solo los encabezados DICOM, sin decodificar píxeles.
+3. Preprocesar imágenes para entrada en modelos CNN:
    - Redimensionar a 512x512.
    - Convertir a escala de grises.
    - Aplicar CLAHE (ecualización adaptativa de histograma).
@@ -12,10 +13,65 @@ Esta clase proporciona métodos para:
    - Expandir dimensiones de batch y canal.
 """
 
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
 import numpy as np
 import cv2
 from PIL import Image
 import pydicom as dicom
+from pydicom.pixels import iter_pixels, pixel_array
+
+
+# Atributos devueltos por PreProcessor.read_header
+HEADER_TAGS = [
+    "PatientID", "StudyInstanceUID", "SeriesInstanceUID", "SOPInstanceUID",
+    "Modality", "ViewPosition", "BodyPartExamined", "Rows", "Columns",
+    "BitsStored", "NumberOfFrames",
+]
+_INT_TAGS = {"Rows", "Columns", "BitsStored", "NumberOfFrames"}
+
+
+class _MemoryReader(io.RawIOBase):
+    """
+    Lector de solo lectura sobre un ``memoryview``.
+
+    A diferencia de ``io.BytesIO``, no copia el buffer completo al crearse:
+    cada lectura copia únicamente el fragmento solicitado.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        chunk = self._view[self._pos:end]
+        self._pos += len(chunk)
+        return chunk.tobytes()
 
 
 class PreProcessor:
@@ -24,8 +80,21 @@ class PreProcessor:
 
     Métodos
     -------
-    read_dicom(path: str) -> tuple[np.ndarray, Image.Image]
-        Lee un archivo DICOM y devuelve un array RGB y un objeto PIL.Image.
+    read_dicom(path) -> tuple[np.ndarray, Image.Image]
+        Lee un DICOM (ruta, bytes o archivo) y devuelve un array RGB y un
+        objeto PIL.Image.
+
+    make_preview(array: np.ndarray, size: tuple) -> np.ndarray
+        Genera una vista previa reducida para la interfaz.
+
+    iter_frames(path) -> Iterator[np.ndarray]
+        Recorre uno a uno los frames RGB de un DICOM multi-frame.
+
+    read_header(path) -> dict
+        Lee solo el encabezado de un DICOM, sin los píxeles.
+
+    scan_headers(directory: str) -> list[dict]
+        Indexa por metadatos todos los DICOM de una carpeta.
     
     read_jpg(path: str) -> tuple[np.ndarray, Image.Image]
         Lee un archivo JPG/PNG y devuelve un array y un objeto PIL.Image.
@@ -36,14 +105,40 @@ class PreProcessor:
     """
 
     @staticmethod
-    def read_dicom(path: str) -> tuple[np.ndarray, Image.Image]:
+    def open_source(source):
+        """
+        Adapta el origen de un DICOM a un objeto aceptado por ``dcmread``.
+
+        Parameters
+        ----------
+        source : str, os.PathLike, bytes, bytearray, memoryview o archivo
+            Ruta, contenido en memoria u objeto tipo archivo.
+
+        Returns
+        -------
+        str or file-like
+            Ruta o lector posicionable. Los ``bytes`` se envuelven en
+            ``io.BytesIO``, que comparte el buffer sin copiarlo; ``bytearray``
+            y ``memoryview`` se leen a través de un ``memoryview``.
+        """
+        if isinstance(source, os.PathLike):
+            return os.fspath(source)
+        if isinstance(source, bytes):
+            return io.BytesIO(source)
+        if isinstance(source, (bytearray, memoryview)):
+            return _MemoryReader(source)
+        return source
+
+    @staticmethod
+    def read_dicom(path) -> tuple[np.ndarray, Image.Image]:
         """
         Lee un archivo DICOM y lo convierte a imagen RGB y PIL.Image.
 
         Parameters
         ----------
-        path : str
-            Ruta al archivo DICOM.
+        path : str, bytes, memoryview o archivo
+            Ruta al archivo DICOM, su contenido en memoria u objeto tipo
+            archivo (ver :meth:`open_source`).
 
         Returns
         -------
@@ -51,14 +146,226 @@ class PreProcessor:
             Imagen en formato RGB con shape (H, W, 3).
         img_pil : PIL.Image.Image
             Imagen en formato PIL.Image para mostrar en UI.
+
+        Notes
+        -----
+        De un DICOM multi-frame se devuelve solo el primer frame, como en
+        :meth:`read_first_frame`; :meth:`iter_frames` recorre todos.
         """
-        img = dicom.dcmread(path)
-        img_array = img.pixel_array
+        img_array = PreProcessor._first_frame(dicom.dcmread(PreProcessor.open_source(path)))
         img_pil = Image.fromarray(img_array)
-        img_norm = np.uint8((np.maximum(img_array, 0) / img_array.max()) * 255.0)
-        img_rgb = cv2.cvtColor(img_norm, cv2.COLOR_GRAY2RGB)
+        img_rgb = PreProcessor.to_rgb(img_array)
         return img_rgb, img_pil
 
+    @staticmethod
+    def _first_frame(ds) -> np.ndarray:
+        """
+        Decodifica solo el primer frame de un dataset, shape (Rows, Columns).
+        """
+        if int(ds.get("NumberOfFrames") or 1) > 1:
+            return pixel_array(ds, index=0)
+        return ds.pixel_array
+
+    @staticmethod
+    def read_first_frame(path, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Lee un DICOM y decodifica solo su primer frame en RGB.
+
+        Devuelve la misma imagen que :meth:`read_dicom`, sin la versión
+        PIL; de un multi-frame no se decodifican los demás frames. La forma del
+        resultado es (Rows, Columns, 3), la que anuncia el encabezado.
+
+        Parameters
+        ----------
+        path : str, bytes, memoryview o archivo
+            Ruta al archivo DICOM o su contenido en memoria.
+        out : np.ndarray, optional
+            Arreglo uint8 (H, W, 3) donde escribir el resultado; ver
+            :meth:`to_rgb`.
+
+        Returns
+        -------
+        np.ndarray
+            Primer frame RGB con shape (H, W, 3) (``out`` si se indicó).
+        """
+        frame = PreProcessor._first_frame(dicom.dcmread(PreProcessor.open_source(path)))
+        return PreProcessor.to_rgb(frame, out)
+
+    @staticmethod
+    def to_rgb(img_array: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Normaliza un frame DICOM a [0, 255] y lo convierte a RGB.
+
+        Parameters
+        ----------
+        img_array : np.ndarray
+            Frame monocromo con shape (H, W).
+        out : np.ndarray, optional
+            Arreglo uint8 (H, W, 3) donde ``cv2.cvtColor`` escribe el
+            resultado, por ejemplo un buffer compartido; así la imagen RGB
+            no se crea aparte para luego copiarla.
+
+        Returns
+        -------
+        np.ndarray
+            Imagen uint8 con shape (H, W, 3) (``out`` si se indicó).
+
+        Raises
+        ------
+        ValueError
+            Si ``out`` no tiene la forma o el tipo esperados.
+        """
+        if out is not None and (out.shape != img_array.shape + (3,) or out.dtype != np.uint8):
+            raise ValueError(
+                f"Se esperaba un arreglo uint8 {img_array.shape + (3,)}, "
+                f"se recibió {out.dtype} {out.shape}."
+            )
+        img_norm = np.uint8((np.maximum(img_array, 0) / img_array.max()) * 255.0)
+        return cv2.cvtColor(img_norm, cv2.COLOR_GRAY2RGB, dst=out)
+
+    @staticmethod
+    def iter_frames(path) -> Iterator[np.ndarray]:
+        """
+        Recorre los frames de un DICOM (de uno o varios frames) en RGB.
+
+        Los frames se decodifican uno a uno con ``pydicom.pixels.iter_pixels``,
+        de modo que un archivo multi-frame grande nunca está completo en
+        memoria. Cada frame se normaliza por separado como en
+        :meth:`read_dicom`.
+
+        Parameters
+        ----------
+        path : str, bytes, memoryview o archivo
+            Ruta al archivo DICOM o su contenido en memoria.
+
+        Yields
+        ------
+        np.ndarray
+            Frame RGB con shape (H, W, 3).
+        """
+        for frame in iter_pixels(PreProcessor.open_source(path)):
+            yield PreProcessor.to_rgb(frame)
+
+    @staticmethod
+    def make_preview(array: np.ndarray, size: tuple = (250, 250)) -> np.ndarray:
+        """
+        Reduce una imagen a una vista previa para la interfaz.
+
+        Se baja por una pirámide gaussiana (``cv2.pyrDown``, mitad de
+        resolución por nivel) mientras la imagen duplique el tamaño pedido, y
+        el último paso se hace con ``INTER_AREA``. Es mucho más barato que
+        ``LANCZOS`` sobre la imagen completa y no produce aliasing.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Imagen original (por ejemplo la devuelta por :meth:`read_dicom`).
+        size : tuple of int, optional
+            Tamaño (ancho, alto) de la vista previa (por defecto 250x250).
+
+        Returns
+        -------
+        np.ndarray
+            Imagen reducida con el mismo número de canales.
+        """
+        img = array
+        while img.shape[1] >= 2 * size[0] and img.shape[0] >= 2 * size[1]:
+            img = cv2.pyrDown(img)
+        return cv2.resize(img, tuple(size), interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def read_header(path) -> dict:
+        """
+        Lee solo el encabezado de un DICOM, sin leer ni decodificar píxeles.
+
+        Parameters
+        ----------
+        path : str, bytes, memoryview o archivo
+            Ruta al archivo DICOM, su contenido en memoria u objeto tipo archivo.
+
+        Returns
+        -------
+        dict
+            Valores de :data:`HEADER_TAGS` (None si el atributo no existe).
+            Si ``path`` es una ruta, se incluye también en la clave ``path``.
+        """
+        ds = dicom.dcmread(
+            PreProcessor.open_source(path),
+            stop_before_pixels=True,
+            specific_tags=HEADER_TAGS,
+        )
+        header = {}
+        for tag in HEADER_TAGS:
+            value = ds.get(tag)
+            if value is not None:
+                value = int(value) if tag in _INT_TAGS else str(value)
+            header[tag] = value
+        header["NumberOfFrames"] = header["NumberOfFrames"] or 1
+        if isinstance(path, (str, os.PathLike)):
+            header["path"] = os.fspath(path)
+        return header
+
+    @staticmethod
+    def scan_headers(directory: str, pattern: str = "**/*.dcm", workers: int = 8,
+                     where: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """
+        Indexa por metadatos los DICOM de una carpeta leyendo solo encabezados.
+
+        Permite filtrar, por ejemplo por modalidad, proyección o tamaño, antes
+        de decodificar los píxeles de los estudios seleccionados.
+
+        Parameters
+        ----------
+        directory : str
+            Carpeta a recorrer.
+        pattern : str, optional
+            Patrón glob relativo a la carpeta (por defecto recursivo "**/*.dcm").
+        workers : int, optional
+            Hilos de lectura en paralelo (por defecto 8).
+        where : callable, optional
+            Filtro que recibe el encabezado y devuelve True para conservarlo.
+
+        Returns
+        -------
+        list of dict
+            Encabezados de los archivos legibles, ordenados por ruta. Los
+            archivos que no son DICOM válidos se omiten.
+
+        Examples
+        --------
+        >>> frontales = PreProcessor.scan_headers(
+        ...     "data", where=lambda h: h["ViewPosition"] in ("PA", "AP"))
+        """
+        paths = sorted(str(p) for p in Path(directory).glob(pattern) if p.is_file())
+
+        def read(path):
+            try:
+                return PreProcessor.read_header(path)
+            except (OSError, dicom.errors.InvalidDicomError):
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            headers = [h for h in executor.map(read, paths) if h is not None]
+        if where is not None:
+            headers = [h for h in headers if where(h)]
+        return headers
+
+    @staticmethod
+    def _gray_512(array: np.ndarray) -> np.ndarray:
+        """
+        Redimensiona a 512x512 y convierte a escala de grises si es RGB.
+        """
+        array_resized = cv2.resize(array, (512, 512))
+        if len(array_resized.shape) == 3 and array_resized.shape[2] == 3:
+            return cv2.cvtColor(array_resized, cv2.COLOR_BGR2GRAY)
+        return array_resized
+
+    @staticmethod
+    def _clahe(gray: np.ndarray, clip_limit: float = 2.0) -> np.ndarray:
+        """
+        Aplica CLAHE con teselas de 4x4.
+        """
+        return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(4, 4)).apply(gray)
 
     @staticmethod
     def preprocess(array: np.ndarray) -> np.ndarray:
@@ -83,15 +390,50 @@ class PreProcessor:
         np.ndarray
             Imagen preprocesada lista para el modelo con shape (1, 512, 512, 1).
         """
-        array_resized = cv2.resize(array, (512, 512))
-        # Convertir a gris si es RGB
-        if len(array_resized.shape) == 3 and array_resized.shape[2] == 3:
-            gray = cv2.cvtColor(array_resized, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = array_resized
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
-        clahe_img = clahe.apply(gray)
+        clahe_img = PreProcessor._clahe(PreProcessor._gray_512(array))
         normalized = clahe_img / 255.0
         batch_array = np.expand_dims(normalized, axis=-1)  # canal
         batch_array = np.expand_dims(batch_array, axis=0)  # batch
         return batch_array
+
+    @staticmethod
+    def augment(array: np.ndarray, shift: int = 16,
+                clip_limits: tuple = (1.0, 3.0)) -> np.ndarray:
+        """
+        Genera vistas aumentadas de una imagen para test-time augmentation.
+
+        Se preprocesa igual que en :meth:`preprocess`, pero se devuelven
+        varias vistas en un solo lote para evaluarlas en una única pasada
+        del modelo. La vista original no se incluye.
+
+        Vistas
+        ------
+        1. Espejo horizontal.
+        2. Desplazamientos de ``shift`` píxeles en x e y (±), con borde replicado.
+        3. CLAHE con cada límite de ``clip_limits`` en lugar de 2.0.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Imagen original en formato NumPy.
+        shift : int, optional
+            Desplazamiento en píxeles sobre la imagen de 512x512 (por defecto 16).
+        clip_limits : tuple of float, optional
+            Límites alternativos de CLAHE (por defecto (1.0, 3.0)).
+
+        Returns
+        -------
+        np.ndarray
+            Lote con shape (K, 512, 512, 1) normalizado a [0, 1].
+        """
+        gray = PreProcessor._gray_512(array)
+        base = PreProcessor._clahe(gray)
+
+        views = [cv2.flip(base, 1)]
+        for dx, dy in ((shift, 0), (-shift, 0), (0, shift), (0, -shift)):
+            matrix = np.float32([[1, 0, dx], [0, 1, dy]])
+            views.append(cv2.warpAffine(base, matrix, (512, 512), borderMode=cv2.BORDER_REPLICATE))
+        for clip_limit in clip_limits:
+            views.append(PreProcessor._clahe(gray, clip_limit))
+
+        return (np.stack(views) / 255.0)[..., np.newaxis]
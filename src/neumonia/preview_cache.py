@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Caché en disco de vistas previas para la interfaz.
+
+Guarda como PNG la vista previa reducida de cada estudio, identificada por
+ruta, tamaño y fecha de modificación del archivo. Al volver a abrir un
+estudio la interfaz lo muestra sin decodificar la imagen completa.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.neumonia.pre_processor import PreProcessor
+
+
+class PreviewCache:
+    """
+    Caché de vistas previas en una carpeta.
+
+    Parameters
+    ----------
+    directory : str
+        Carpeta de la caché; se crea al guardar la primera vista previa.
+    size : tuple of int, optional
+        Tamaño (ancho, alto) de las vistas previas (por defecto 250x250).
+    """
+
+    def __init__(self, directory: str, size: Tuple[int, int] = (250, 250)):
+        self.directory = Path(directory)
+        self.size = tuple(size)
+
+    def _entry(self, path: str) -> Path:
+        """
+        Archivo de la caché correspondiente a la versión actual de ``path``.
+        """
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.size}"
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()}.png"
+
+    def get(self, path: str) -> Optional[Image.Image]:
+        """
+        Devuelve la vista previa guardada, o None si no existe o el
+        archivo cambió.
+        """
+        entry = self._entry(path)
+        if not entry.exists():
+            return None
+        with Image.open(entry) as img:
+            img.load()
+            return img
+
+    def put(self, path: str, array: np.ndarray) -> Image.Image:
+        """
+        Genera la vista previa de la imagen ya decodificada y la guarda.
+
+        Parameters
+        ----------
+        path : str
+            Ruta del estudio.
+        array : np.ndarray
+            Imagen completa del estudio.
+
+        Returns
+        -------
+        PIL.Image.Image
+            Vista previa generada.
+        """
+        preview = Image.fromarray(PreProcessor.make_preview(array, self.size))
+        entry = self._entry(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(".tmp")
+        preview.save(tmp, format="PNG")
+        os.replace(tmp, entry)
+        return preview
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Medición de recursos del proceso actual (memoria residente y CPU).
+
+Usa ``psutil`` si está instalado; en su defecto lee ``/proc`` en Linux o,
+como último recurso, el pico de memoria de ``resource``.
+:func:`trim_heap` devuelve al sistema la memoria libre del proceso.
+"""
+
+import gc
+import os
+import time
+import ctypes
+import ctypes.util
+
+try:
+    import psutil
+except ImportError:  # dependencia opcional
+    psutil = None
+
+
+def current_rss_bytes() -> int:
+    """
+    Devuelve la memoria residente (RSS) actual del proceso en bytes.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss es el pico, en KB en Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def trim_heap() -> None:
+    """
+    Recolecta basura y devuelve al sistema operativo la memoria libre del
+    heap de C (``malloc_trim`` de glibc). Sin glibc solo recolecta basura.
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class CPUMeter:
+    """
+    Mide el uso de CPU del proceso entre llamadas sucesivas.
+
+    El valor es relativo a un núcleo: 200 % equivale a dos núcleos ocupados.
+    """
+
+    def __init__(self):
+        self._last_wall = time.perf_counter()
+        self._last_cpu = time.process_time()
+
+    def percent(self) -> float:
+        """
+        Porcentaje de CPU usado desde la llamada anterior (o la creación).
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        elapsed = wall - self._last_wall
+        used = cpu - self._last_cpu
+        self._last_wall, self._last_cpu = wall, cpu
+        return 100.0 * used / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Resultado compacto de una predicción.
+
+Un :class:`PredictionResult` guarda solo lo necesario para reconstruir la
+salida completa: el índice de la clase, las probabilidades de las tres
+clases y el Grad-CAM crudo a la resolución nativa de la capa convolucional.
+La superposición coloreada se genera bajo demanda a partir de la imagen
+original, en lugar de retener una imagen RGB de 512x512 por estudio.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.neumonia.grad_cam import GradCAMModel
+from src.neumonia.load_model import LABEL_MAP
+
+
+@dataclass(slots=True)
+class PredictionResult:
+    """
+    Resultado de la predicción de un estudio.
+
+    Attributes
+    ----------
+    label_index : int
+        Índice de la clase predicha.
+    probabilities : np.ndarray
+        Probabilidades de cada clase en float32, shape (3,).
+    cam : np.ndarray or None
+        Grad-CAM normalizado a [0, 1] en float16, shape (h, w). Es None si
+        el estudio se resolvió en la primera pasada de la cascada.
+    patient_id : str
+        Identificador del paciente.
+    views : int
+        Vistas promediadas en ``probabilities`` (más de 1 con test-time
+        augmentation).
+    screened : bool
+        True si el resultado viene del modelo de tamizaje de la cascada y
+        no del modelo completo.
+    """
+
+    label_index: int
+    probabilities: np.ndarray
+    cam: Optional[np.ndarray]
+    patient_id: str = ""
+    views: int = 1
+    screened: bool = False
+
+    @classmethod
+    def from_outputs(cls, preds: np.ndarray, cam: np.ndarray, patient_id: str = ""):
+        """
+        Construye el resultado a partir de la salida de
+        :meth:`GradCAMModel.compute_cam` para una imagen.
+
+        Parameters
+        ----------
+        preds : np.ndarray
+            Probabilidades de la imagen, shape (3,).
+        cam : np.ndarray
+            Grad-CAM crudo de la imagen, shape (h, w).
+        patient_id : str, optional
+            Identificador del paciente.
+        """
+        probabilities = np.asarray(preds, dtype=np.float32)
+        return cls(
+            label_index=int(np.argmax(probabilities)),
+            probabilities=probabilities,
+            cam=np.asarray(cam, dtype=np.float16),
+            patient_id=patient_id,
+        )
+
+    @property
+    def label(self) -> str:
+        """
+        Etiqueta predicha ('bacteriana', 'viral', 'normal').
+        """
+        return LABEL_MAP.get(self.label_index, "desconocida")
+
+    @property
+    def prob(self) -> float:
+        """
+        Probabilidad de la clase predicha en porcentaje.
+        """
+        return float(self.probabilities[self.label_index] * 100)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes ocupados por los arreglos del resultado.
+        """
+        return self.probabilities.nbytes + (0 if self.cam is None else self.cam.nbytes)
+
+    def render_overlay(self, array: np.ndarray, size: Tuple[int, int] = (512, 512)) -> np.ndarray:
+        """
+        Genera la imagen con el Grad-CAM superpuesto.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Imagen original en formato RGB.
+        size : tuple of int, optional
+            Tamaño (ancho, alto) del resultado (por defecto 512x512).
+
+        Returns
+        -------
+        np.ndarray
+            Imagen RGB con el mapa de calor superpuesto.
+
+        Raises
+        ------
+        ValueError
+            Si el resultado no tiene Grad-CAM (resuelto en el tamizaje).
+        """
+        if self.cam is None:
+            raise ValueError("El estudio se resolvió en el tamizaje y no tiene Grad-CAM.")
+        return GradCAMModel.render_overlay(self.cam, array, size)
+
+
+@dataclass(slots=True)
+class StudyResult:
+    """
+    Resultado agregado de un estudio con varios frames, imágenes o series.
+
+    Attributes
+    ----------
+    patient_id : str
+        Identificador del paciente.
+    probabilities : np.ndarray
+        Promedio de las probabilidades de todos los frames, shape (3,).
+    frames : list of PredictionResult
+        Resultado de cada frame, en orden de lectura. Su ``patient_id``
+        identifica el origen como ``"<ruta>#<frame>"``.
+    series : dict
+        Probabilidades promedio por ``SeriesInstanceUID``.
+    """
+
+    patient_id: str
+    probabilities: np.ndarray
+    frames: List[PredictionResult] = field(default_factory=list)
+    series: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def label_index(self) -> int:
+        """
+        Índice de la clase con mayor probabilidad promedio.
+        """
+        return int(np.argmax(self.probabilities))
+
+    @property
+    def label(self) -> str:
+        """
+        Etiqueta agregada del estudio.
+        """
+        return LABEL_MAP.get(self.label_index, "desconocida")
+
+    @property
+    def prob(self) -> float:
+        """
+        Probabilidad agregada de la clase predicha en porcentaje.
+        """
+        return float(self.probabilities[self.label_index] * 100)
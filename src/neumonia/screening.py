@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Primera pasada barata para la cascada de tamizaje.
+
+:class:`ScreeningModel` evalúa un lote preprocesado con un modelo ligero y
+devuelve solo probabilidades, sin Grad-CAM. Puede ser:
+
+- la variante cuantizada del modelo principal (pesos int8 con rango
+  dinámico), generada con TensorFlow Lite y guardada en la caché para no
+  convertirla en cada arranque;
+- un modelo propio (``.tflite``, ``.h5`` o ``.keras``), por ejemplo uno
+  entrenado con una entrada de menor resolución; el lote se reduce al
+  tamaño de su entrada.
+
+Usa el intérprete de ``ai_edge_litert`` si está instalado y, si no, el de
+``tf.lite``.
+"""
+
+import io
+import os
+import warnings
+import contextlib
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:  # dependencia opcional
+    Interpreter = None
+
+
+def _make_interpreter(content: bytes, num_threads: Optional[int] = None):
+    """
+    Crea un intérprete TFLite para el modelo serializado ``content``.
+    """
+    if Interpreter is not None:
+        return Interpreter(model_content=content, num_threads=num_threads)
+    import tensorflow as tf
+
+    with warnings.catch_warnings():
+        # tf.lite.Interpreter avisa que se reemplazará por ai_edge_litert
+        warnings.simplefilter("ignore", UserWarning)
+        return tf.lite.Interpreter(model_content=content, num_threads=num_threads)
+
+
+class ScreeningModel:
+    """
+    Modelo de la primera pasada de la cascada.
+
+    Se construye con :meth:`quantize` o :meth:`load`.
+
+    Parameters
+    ----------
+    keras_model : tf.keras.Model, optional
+        Modelo Keras; se usa si no se da ``tflite_content``.
+    tflite_content : bytes, optional
+        Modelo TFLite serializado.
+    num_threads : int, optional
+        Hilos del intérprete TFLite.
+
+    Attributes
+    ----------
+    version : str or None
+        Versión del modelo: la del modelo principal para la variante
+        cuantizada (:meth:`quantize`) o el SHA-256 del archivo
+        (:meth:`load`).
+    """
+
+    def __init__(self, keras_model=None, tflite_content: Optional[bytes] = None,
+                 num_threads: Optional[int] = None):
+        if (keras_model is None) == (tflite_content is None):
+            raise ValueError("Se requiere exactamente uno de keras_model o tflite_content.")
+        self._keras_model = keras_model
+        # Identificador del modelo; lo fijan quantize y load
+        self.version: Optional[str] = None
+        self._interpreter = None
+        # El intérprete TFLite no admite llamadas concurrentes
+        self._lock = threading.Lock()
+        if tflite_content is not None:
+            self._interpreter = _make_interpreter(tflite_content, num_threads)
+            self._interpreter.allocate_tensors()
+            self._input = self._interpreter.get_input_details()[0]
+            self._output = self._interpreter.get_output_details()[0]
+            shape = self._input["shape"]
+        else:
+            shape = keras_model.inputs[0].shape
+        self.input_size: Tuple[int, int] = (int(shape[1]), int(shape[2]))
+
+    @classmethod
+    def quantize(cls, model, cache_dir: Optional[str] = None, version: Optional[str] = None,
+                 num_threads: Optional[int] = None) -> "ScreeningModel":
+        """
+        Crea la variante cuantizada (rango dinámico) de un modelo Keras.
+
+        Parameters
+        ----------
+        model : tf.keras.Model
+            Modelo principal.
+        cache_dir : str, optional
+            Carpeta donde guardar el ``.tflite`` generado.
+        version : str, optional
+            Identificador del modelo (por ejemplo
+            :attr:`ModelLoader.model_version`); con ``cache_dir`` da nombre
+            al archivo, de modo que solo se convierte una vez por modelo.
+        num_threads : int, optional
+            Hilos del intérprete TFLite.
+        """
+        cached = Path(cache_dir) / f"{version}.tflite" if cache_dir and version else None
+        if cached is not None and cached.exists():
+            screening = cls(tflite_content=cached.read_bytes(), num_threads=num_threads)
+            screening.version = version
+            return screening
+
+        import tensorflow as tf
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        # El conversor imprime en stdout la ruta del SavedModel temporal
+        with contextlib.redirect_stdout(io.StringIO()):
+            content = converter.convert()
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(".tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, cached)
+        screening = cls(tflite_content=content, num_threads=num_threads)
+        screening.version = version
+        return screening
+
+    @classmethod
+    def load(cls, path: str, num_threads: Optional[int] = None) -> "ScreeningModel":
+        """
+        Carga un modelo de tamizaje propio (``.tflite``, ``.h5`` o ``.keras``).
+
+        Raises
+        ------
+        FileNotFoundError
+            Si el archivo no existe.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No se encontró el modelo de tamizaje: {path}")
+        from src.neumonia.load_model import ModelLoader
+
+        if str(path).endswith(".tflite"):
+            screening = cls(tflite_content=Path(path).read_bytes(), num_threads=num_threads)
+        else:
+            screening = cls(keras_model=ModelLoader._read_model(path))
+        screening.version = ModelLoader.file_hash(path)
+        return screening
+
+    def _fit_input(self, img_batch: np.ndarray) -> np.ndarray:
+        """
+        Reduce el lote al tamaño de entrada del modelo si es distinto.
+        """
+        height, width = self.input_size
+        img_batch = np.asarray(img_batch, dtype=np.float32)
+        if img_batch.shape[1:3] == (height, width):
+            return img_batch
+        resized = [cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+                   for img in img_batch]
+        return np.stack(resized).reshape(len(img_batch), height, width, -1)
+
+    def predict(self, img_batch: np.ndarray) -> np.ndarray:
+        """
+        Probabilidades por clase de un lote preprocesado.
+
+        Parameters
+        ----------
+        img_batch : np.ndarray
+            Lote con shape (N, 512, 512, 1) generado por
+            :meth:`PreProcessor.preprocess`.
+
+        Returns
+        -------
+        np.ndarray
+            Probabilidades con shape (N, clases) en float32.
+        """
+        img_batch = self._fit_input(img_batch)
+        if self._interpreter is None:
+            return self._keras_model.predict(img_batch, verbose=0).astype(np.float32)
+        with self._lock:
+            index = self._input["index"]
+            if tuple(self._interpreter.get_input_details()[0]["shape"]) != img_batch.shape:
+                self._interpreter.resize_tensor_input(index, img_batch.shape)
+                self._interpreter.allocate_tensors()
+            self._interpreter.set_tensor(index, img_batch)
+            self._interpreter.invoke()
+            return self._interpreter.get_tensor(self._output["index"]).astype(np.float32)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Modo sombra: evaluación de modelos candidatos sobre el tráfico real.
+
+:class:`ShadowScorer` recibe cada lote ya preprocesado que evaluó el modelo
+principal y, en un hilo en segundo plano, lo pasa por los modelos
+candidatos. Las probabilidades y la latencia de cada modelo, incluido el
+principal, se guardan en la tabla ``shadow_scores`` de :class:`StudyIndex`.
+Los estudios que la cascada resolvió en el tamizaje se registran con el
+nombre ``screening`` y la versión del modelo de tamizaje, no como del
+modelo principal.
+
+La respuesta principal no espera a los candidatos: :meth:`ShadowScorer.submit`
+solo encola el lote y, si la cola está llena, lo descarta y lo cuenta en
+``dropped``.
+"""
+
+import time
+import uuid
+import queue
+import threading
+import contextlib
+from typing import Callable, ContextManager, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.neumonia.load_model import ModelLoader
+from src.neumonia.result import PredictionResult
+from src.neumonia.study_index import StudyIndex
+
+# Nombres con que se registran el modelo principal y el tamizaje de la cascada
+PRIMARY = "primary"
+SCREENING = "screening"
+
+
+class ShadowScorer(threading.Thread):
+    """
+    Hilo que evalúa los lotes del modelo principal con modelos candidatos.
+
+    Parameters
+    ----------
+    models : dict
+        Nombre -> ruta del modelo candidato (``.h5`` o ``.keras``).
+    db_path : str
+        Base SQLite donde se guardan los resultados.
+    queue_size : int, optional
+        Lotes pendientes como máximo; los que no caben se descartan
+        (por defecto 16).
+    guard : callable, optional
+        Fábrica de un context manager que envuelve cada ejecución de un
+        candidato, por ejemplo ``Integrator._inference`` para que
+        :meth:`Integrator.release_memory` no limpie la sesión mientras tanto.
+    """
+
+    def __init__(self, models: Dict[str, str], db_path: str, queue_size: int = 16,
+                 guard: Optional[Callable[[], ContextManager]] = None):
+        super().__init__(name="neumonia-shadow", daemon=True)
+        for reserved in (PRIMARY, SCREENING):
+            if reserved in models:
+                raise ValueError(f"El nombre '{reserved}' está reservado.")
+        self.model_paths = dict(models)
+        self.db_path = db_path
+        self.guard = guard or contextlib.nullcontext
+        self.dropped = 0
+        self.errors: List[Exception] = []
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        # Los modelos se cargan en el hilo: el arranque no espera por ellos
+        self._ready = threading.Event()
+
+    def submit(self, img_batch: np.ndarray, results: Sequence[PredictionResult],
+               latency: float, model_version: str,
+               screening_version: Optional[str] = None) -> bool:
+        """
+        Encola un lote evaluado por el modelo principal, sin bloquear.
+
+        Parameters
+        ----------
+        img_batch : np.ndarray
+            Lote preprocesado con shape (N, 512, 512, 1); no debe
+            modificarse después.
+        results : sequence of PredictionResult
+            Resultados finales del modelo principal para el lote (ya con
+            test-time augmentation si se aplicó).
+        latency : float
+            Segundos que tardó el modelo principal.
+        model_version : str
+            Versión (SHA-256) del modelo principal.
+        screening_version : str, optional
+            Versión del modelo de tamizaje, para los resultados con
+            ``screened=True``.
+
+        Returns
+        -------
+        bool
+            False si la cola estaba llena y el lote se descartó.
+        """
+        primary = [
+            (r.patient_id, SCREENING, screening_version, r.label_index, r.probabilities)
+            if r.screened else
+            (r.patient_id, PRIMARY, model_version, r.label_index, r.probabilities)
+            for r in results
+        ]
+        try:
+            self._queue.put_nowait((uuid.uuid4().hex, img_batch, primary, latency))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que los modelos candidatos estén cargados.
+        """
+        return self._ready.wait(timeout)
+
+    def join_queue(self):
+        """
+        Espera a que se procesen los lotes encolados hasta el momento.
+        """
+        self._queue.join()
+
+    def run(self):
+        models = {}
+        for name, path in self.model_paths.items():
+            try:
+                model = ModelLoader._read_model(path)
+                ModelLoader.warm_up(model)
+                models[name] = (model, ModelLoader.file_hash(path))
+            except Exception as exc:
+                self.errors.append(exc)
+        self._ready.set()
+
+        index = None
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                if index is None:
+                    index = StudyIndex(self.db_path)
+                index.put_shadow(self._score(item, models))
+            except Exception as exc:
+                # Un lote que falla (por ejemplo, la base bloqueada por otro
+                # proceso) se descarta; el hilo sigue atendiendo la cola
+                self.errors.append(exc)
+            finally:
+                self._queue.task_done()
+        if index is not None:
+            index.close()
+
+    def _score(self, item: tuple, models: dict) -> list:
+        """
+        Evalúa un lote con los candidatos y arma las filas de ``shadow_scores``.
+        """
+        batch_id, img_batch, primary, latency = item
+        rows = [
+            (batch_id, i, pid, name, version, label, probs, latency)
+            for i, (pid, name, version, label, probs) in enumerate(primary)
+        ]
+        for name, (model, version) in models.items():
+            try:
+                with self.guard():
+                    start = time.perf_counter()
+                    preds = np.asarray(model.predict_on_batch(img_batch))
+                    elapsed = time.perf_counter() - start
+            except Exception as exc:
+                self.errors.append(exc)
+                continue
+            rows.extend(
+                (batch_id, i, pid, name, version, int(np.argmax(p)), p, elapsed)
+                for i, ((pid, *_), p) in enumerate(zip(primary, preds))
+            )
+        return rows
+
+    def stop(self, timeout: Optional[float] = 30.0):
+        """
+        Procesa los lotes pendientes y detiene el hilo.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Segundos máximos de espera para encolar la señal de fin y para
+            que el hilo termine (por defecto 30); None espera sin límite.
+        """
+        if not self.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.join(timeout)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Índice persistente (SQLite) de estudios ya evaluados.
+
+Cada estudio se registra por ruta, tamaño, fecha de modificación, hash del
+contenido y versión del modelo. :class:`IncrementalScorer` usa el índice para
+evaluar solo los archivos nuevos o modificados de una carpeta, de modo que
+una corrida nocturna sobre un archivo que crece cuesta en proporción a los
+cambios y no al tamaño total.
+
+La tabla ``shadow_scores`` guarda las probabilidades y la latencia de cada
+modelo en el modo sombra (:mod:`src.neumonia.shadow`).
+"""
+
+import os
+import csv
+import json
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.neumonia.load_model import ModelLoader
+from src.neumonia.pipeline import StreamingPipeline
+
+
+class StudyIndex:
+    """
+    Índice SQLite de resultados por estudio y versión del modelo.
+
+    Parameters
+    ----------
+    db_path : str
+        Ruta al archivo SQLite; se crea junto con su carpeta si no existe.
+    timeout : float, optional
+        Segundos que una escritura espera si otro proceso tiene la base
+        bloqueada (por defecto 30).
+
+    Notes
+    -----
+    La base usa el modo WAL, de modo que varios procesos (por ejemplo los
+    trabajadores de :class:`InferenceWorkerPool` con el modo sombra) pueden
+    escribir en el mismo archivo y leer mientras otro escribe.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=timeout)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS studies (
+                    path TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    label_index INTEGER NOT NULL,
+                    probabilities TEXT NOT NULL,
+                    scored_at REAL NOT NULL,
+                    PRIMARY KEY (path, model_version)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS studies_hash ON studies (sha256, model_version)"
+            )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS shadow_scores (
+                    batch_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    patient_id TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    label_index INTEGER NOT NULL,
+                    probabilities TEXT NOT NULL,
+                    latency_ms REAL NOT NULL,
+                    scored_at REAL NOT NULL,
+                    PRIMARY KEY (batch_id, position, model)
+                )
+                """
+            )
+
+    def get(self, path: str, model_version: str) -> Optional[sqlite3.Row]:
+        """
+        Devuelve el registro de una ruta para una versión del modelo.
+        """
+        return self.conn.execute(
+            "SELECT * FROM studies WHERE path = ? AND model_version = ?",
+            (path, model_version),
+        ).fetchone()
+
+    def find_by_hash(self, sha256: str, model_version: str) -> Optional[sqlite3.Row]:
+        """
+        Devuelve algún registro con el mismo contenido y versión del modelo.
+        """
+        return self.conn.execute(
+            "SELECT * FROM studies WHERE sha256 = ? AND model_version = ? LIMIT 1",
+            (sha256, model_version),
+        ).fetchone()
+
+    def put(self, path: str, model_version: str, size: int, mtime_ns: int, sha256: str,
+            label_index: int, probabilities) -> None:
+        """
+        Inserta o reemplaza el registro de una ruta.
+        """
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO studies VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path, model_version, size, mtime_ns, sha256, int(label_index),
+                    json.dumps([float(p) for p in probabilities]), time.time(),
+                ),
+            )
+
+    def put_shadow(self, rows: Iterable[tuple]) -> None:
+        """
+        Inserta resultados del modo sombra.
+
+        Parameters
+        ----------
+        rows : iterable of tuple
+            Tuplas (batch_id, posición en el lote, patient_id, modelo,
+            versión del modelo, índice de clase, probabilidades, latencia
+            del lote en segundos).
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO shadow_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (batch_id, int(position), patient_id, model, version, int(label),
+                     json.dumps([float(p) for p in probs]), latency * 1000, now)
+                    for batch_id, position, patient_id, model, version, label, probs, latency
+                    in rows
+                ],
+            )
+
+    def shadow_summary(self, primary: str = "primary") -> List[dict]:
+        """
+        Resume el modo sombra por modelo: estudios, latencia media del lote
+        y concordancia de etiquetas con el modelo principal.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT s.model, s.model_version, COUNT(*) AS studies,
+                   AVG(s.latency_ms) AS mean_latency_ms,
+                   AVG(s.label_index = p.label_index) AS agreement
+            FROM shadow_scores s
+            JOIN shadow_scores p
+              ON p.batch_id = s.batch_id AND p.position = s.position AND p.model = ?
+            GROUP BY s.model, s.model_version
+            ORDER BY s.model = ? DESC, s.model
+            """,
+            (primary, primary),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export_shadow_csv(self, path: str) -> int:
+        """
+        Exporta la tabla ``shadow_scores`` a CSV, una fila por estudio y
+        modelo.
+
+        Returns
+        -------
+        int
+            Filas exportadas.
+        """
+        cursor = self.conn.execute(
+            "SELECT * FROM shadow_scores ORDER BY scored_at, batch_id, position, model"
+        )
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([column[0] for column in cursor.description])
+            for row in cursor:
+                writer.writerow(tuple(row))
+                count += 1
+        return count
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM studies").fetchone()[0]
+
+    def close(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        self.conn.close()
+
+
+class IncrementalScorer:
+    """
+    Evalúa con el integrador solo los estudios nuevos o modificados.
+
+    Un archivo se omite si su ruta ya está registrada para la versión actual
+    del modelo con el mismo tamaño y fecha de modificación. Si cambiaron pero
+    el contenido (SHA-256) coincide con un estudio ya evaluado, se reutiliza
+    ese resultado sin ejecutar el modelo.
+
+    Parameters
+    ----------
+    integrator : Integrator
+        Integrador que ejecuta las predicciones.
+    index : StudyIndex
+        Índice donde se consultan y guardan los resultados.
+    batch_size : int, optional
+        Estudios por pasada del modelo (por defecto 8).
+    save_csv : bool, optional
+        Si es True, los estudios evaluados también se guardan en el CSV.
+    """
+
+    def __init__(self, integrator, index: StudyIndex, batch_size: int = 8,
+                 save_csv: bool = False):
+        self.integrator = integrator
+        self.index = index
+        self.batch_size = batch_size
+        self.save_csv = save_csv
+
+    def run(self, directory: str, pattern: str = "**/*.dcm") -> Dict[str, int]:
+        """
+        Recorre la carpeta y evalúa los estudios pendientes.
+
+        Parameters
+        ----------
+        directory : str
+            Carpeta con los estudios.
+        pattern : str, optional
+            Patrón glob relativo a la carpeta (por defecto recursivo "**/*.dcm").
+
+        Returns
+        -------
+        dict
+            Conteos ``scored`` (evaluados), ``reused`` (resultado reutilizado
+            por hash), ``skipped`` (sin cambios) y ``failed``.
+        """
+        model_version = self.integrator.model_version
+        summary = {"scored": 0, "reused": 0, "skipped": 0, "failed": 0}
+        pending = {}
+
+        for path in sorted(str(p) for p in Path(directory).glob(pattern) if p.is_file()):
+            stat = os.stat(path)
+            row = self.index.get(path, model_version)
+            if row is not None and (row["size"], row["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                summary["skipped"] += 1
+                continue
+
+            sha256 = ModelLoader.file_hash(path)
+            same = self.index.find_by_hash(sha256, model_version)
+            if same is not None:
+                self.index.put(path, model_version, stat.st_size, stat.st_mtime_ns, sha256,
+                               same["label_index"], json.loads(same["probabilities"]))
+                summary["reused"] += 1
+                continue
+            pending[path] = (stat.st_size, stat.st_mtime_ns, sha256)
+
+        pipeline = StreamingPipeline(self.integrator, batch_size=self.batch_size, skip_errors=True)
+        for result in pipeline.run((path, path) for path in pending):
+            size, mtime_ns, sha256 = pending[result.patient_id]
+            self.index.put(result.patient_id, model_version, size, mtime_ns, sha256,
+                           result.label_index, np.asarray(result.probabilities))
+            if self.save_csv:
+                self.integrator.save_result(Path(result.patient_id).stem, result.label, result.prob)
+            summary["scored"] += 1
+        summary["failed"] = len(pipeline.errors)
+        return summary
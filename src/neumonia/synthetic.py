@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Datos y modelo sintéticos para pruebas de carga sin datos reales.
+
+- :func:`write_dicom` y :func:`generate_dataset` crean radiografías DICOM
+  sintéticas de tamaños realistas (2000–4000 px, 12 o 16 bits).
+- :func:`build_standin_model` crea un modelo con la misma interfaz que
+  ``conv_MLP_84.h5``: entrada (512, 512, 1), capa ``conv10_thisone`` y
+  salida softmax de 3 clases.
+- :func:`write_standin_config` guarda ese modelo y un ``config.json`` que
+  apunta a él, para ejecutar los benchmarks sin ``conv_MLP_84.h5``.
+"""
+
+import os
+import json
+from typing import List, Optional, Sequence
+
+import numpy as np
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, SecondaryCaptureImageStorage, generate_uid
+
+
+def synthetic_chest(rows: int, cols: int, bits_stored: int = 12,
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Genera una imagen que imita una radiografía de tórax: fondo claro,
+    dos campos pulmonares oscuros y ruido.
+
+    Parameters
+    ----------
+    rows, cols : int
+        Tamaño de la imagen.
+    bits_stored : int, optional
+        Bits efectivos por píxel (por defecto 12).
+    rng : np.random.Generator, optional
+        Generador aleatorio.
+
+    Returns
+    -------
+    np.ndarray
+        Imagen uint16 con shape (rows, cols).
+    """
+    rng = rng or np.random.default_rng()
+    y = np.linspace(-1, 1, rows, dtype=np.float32)[:, None]
+    x = np.linspace(-1, 1, cols, dtype=np.float32)[None, :]
+    image = 0.8 - 0.15 * (x ** 2 + y ** 2)
+    for center in (-0.4, 0.4):
+        cx = center + rng.uniform(-0.05, 0.05)
+        lung = ((x - cx) / 0.3) ** 2 + ((y + 0.05) / 0.6) ** 2
+        image -= 0.45 * np.exp(-lung ** 2)
+    image += rng.normal(0, 0.03, (rows, cols)).astype(np.float32)
+    max_value = (1 << bits_stored) - 1
+    return (np.clip(image, 0, 1) * max_value).astype(np.uint16)
+
+
+def write_dicom(path, array: np.ndarray, bits_stored: int = 12) -> str:
+    """
+    Escribe un arreglo 2D (o 3D multi-frame) como archivo DICOM monocromo.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Ruta de destino.
+    array : np.ndarray
+        Píxeles con shape (H, W) o (frames, H, W); se guardan como uint16.
+    bits_stored : int, optional
+        Bits efectivos por píxel (por defecto 12).
+
+    Returns
+    -------
+    str
+        Ruta del archivo escrito.
+    """
+    array = np.ascontiguousarray(array, dtype=np.uint16)
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = SecondaryCaptureImageStorage
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = meta.MediaStorageSOPClassUID
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.Modality = "CR"
+    ds.PatientID = "0000"
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.Rows, ds.Columns = array.shape[-2:]
+    if array.ndim == 3:
+        ds.NumberOfFrames = array.shape[0]
+    ds.BitsAllocated = 16
+    ds.BitsStored = bits_stored
+    ds.HighBit = bits_stored - 1
+    ds.PixelRepresentation = 0
+    ds.PixelData = array.tobytes()
+    ds.save_as(path, enforce_file_format=True)
+    return str(path)
+
+
+def generate_dataset(directory: str, count: int, min_size: int = 2000, max_size: int = 4000,
+                     bits: Sequence[int] = (12, 16), seed: int = 0) -> List[str]:
+    """
+    Genera una carpeta de estudios DICOM sintéticos.
+
+    Parameters
+    ----------
+    directory : str
+        Carpeta de destino; se crea si no existe.
+    count : int
+        Número de estudios.
+    min_size, max_size : int, optional
+        Rango del lado de cada imagen en píxeles (por defecto 2000–4000).
+    bits : sequence of int, optional
+        Profundidades de bits posibles (por defecto 12 y 16).
+    seed : int, optional
+        Semilla para reproducibilidad.
+
+    Returns
+    -------
+    list of str
+        Rutas de los archivos generados.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        rows, cols = rng.integers(min_size, max_size + 1, size=2)
+        bits_stored = int(rng.choice(bits))
+        image = synthetic_chest(int(rows), int(cols), bits_stored, rng)
+        paths.append(write_dicom(os.path.join(directory, f"sintetico_{i:05d}.dcm"), image, bits_stored))
+    return paths
+
+
+def build_standin_model(seed: int = 0):
+    """
+    Construye un modelo sustituto con la interfaz de ``conv_MLP_84.h5``.
+
+    Tiene varias convoluciones para que su costo sea representativo, la
+    capa ``conv10_thisone`` que usa el Grad-CAM y una salida de 3 clases.
+    Sus predicciones no tienen significado clínico.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Semilla para inicializar los pesos.
+
+    Returns
+    -------
+    tf.keras.Model
+        Modelo con entrada (512, 512, 1).
+    """
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(seed)
+    inputs = tf.keras.Input(shape=(512, 512, 1))
+    x = inputs
+    for filters in (16, 32, 64, 128):
+        x = tf.keras.layers.Conv2D(filters, 3, padding="same", activation="relu")(x)
+        x = tf.keras.layers.MaxPooling2D(2)(x)
+    x = tf.keras.layers.Conv2D(128, 3, padding="same", activation="relu", name="conv10_thisone")(x)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    x = tf.keras.layers.Dense(64, activation="relu")(x)
+    outputs = tf.keras.layers.Dense(3, activation="softmax")(x)
+    return tf.keras.Model(inputs, outputs, name="standin_conv_MLP_84")
+
+
+def write_standin_config(directory: str, seed: int = 0) -> str:
+    """
+    Guarda el modelo sustituto y una configuración temporal que lo usa.
+
+    Las rutas de CSV, reportes PDF y cachés quedan dentro de ``directory``.
+
+    Parameters
+    ----------
+    directory : str
+        Carpeta donde se escriben ``standin.h5`` y ``config.json``.
+    seed : int, optional
+        Semilla del modelo (ver :func:`build_standin_model`).
+
+    Returns
+    -------
+    str
+        Ruta al ``config.json``.
+    """
+    model_path = os.path.join(directory, "standin.h5")
+    build_standin_model(seed).save(model_path)
+    config_path = os.path.join(directory, "config.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "model_path": model_path,
+            "csv_path": os.path.join(directory, "csv", "historial.csv"),
+            "pdf_path": os.path.join(directory, "reportes"),
+            "cache_path": os.path.join(directory, "cache"),
+        }, f)
+    return config_path
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pool de procesos para inferencia en paralelo.
+
+Cada trabajador es un proceso independiente con su propio
+:class:`Integrator`, de modo que la lectura DICOM y el preprocesamiento no
+compiten por el GIL y los trabajadores respetan las mismas claves de la
+configuración que el proceso principal (``tta_threshold``,
+``cascade_threshold``, ``shadow_models``, ...). Los hilos internos de
+TensorFlow (intra-op e inter-op) se fijan por trabajador para que N procesos
+no sobresuscriban los núcleos.
+
+Notes
+-----
+Cada trabajador carga su propia copia de los pesos en su heap: la memoria
+residente crece como N veces el tamaño del modelo cargado (más el runtime de
+TensorFlow de cada proceso, y los modelos de tamizaje y sombra si están
+configurados). Los pesos no se comparten ni se mapean en memoria; solo la
+lectura del archivo ``.h5`` aprovecha la caché de páginas del sistema.
+
+El runtime de TensorFlow no es seguro ante ``fork`` una vez inicializado,
+por lo que los trabajadores se crean con ``spawn`` y cargan el modelo en su
+propia inicialización.
+"""
+
+import os
+import json
+import multiprocessing
+import multiprocessing.util
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+# Estado por proceso trabajador, creado en _init_worker
+_worker = {}
+
+
+def _init_worker(config_path: str, intra_op_threads: int, inter_op_threads: int,
+                 with_heatmap: bool):
+    """
+    Inicializa un proceso trabajador: fija los hilos de TensorFlow y
+    crea su :class:`Integrator`.
+    """
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    from src.neumonia.load_model import ModelLoader
+    from src.neumonia.integrator import Integrator
+
+    # Debe hacerse antes de ejecutar cualquier operación de TensorFlow
+    ModelLoader.configure_threads(intra_op_threads, inter_op_threads)
+
+    integrator = Integrator(config_path=config_path, hot_reload=False)
+    # Al terminar el trabajador se vacía la cola del modo sombra
+    multiprocessing.util.Finalize(integrator, integrator.close, exitpriority=10)
+    _worker["integrator"] = integrator
+    _worker["with_heatmap"] = with_heatmap
+
+
+def _process_study(item: Tuple[str, str]) -> Tuple[str, str, float, Optional[np.ndarray]]:
+    """
+    Procesa un estudio dentro de un trabajador con :meth:`Integrator.predict`.
+
+    Parameters
+    ----------
+    item : tuple of str
+        Par (patient_id, ruta al archivo DICOM).
+
+    Returns
+    -------
+    tuple
+        (patient_id, etiqueta, probabilidad en %, heatmap o None). El
+        heatmap es None si no se pidió o si el estudio se resolvió en el
+        tamizaje de la cascada.
+    """
+    integrator = _worker["integrator"]
+    patient_id, path = item
+    array, _ = integrator.load_image(path)
+    result = integrator.predict(array, patient_id)
+    heatmap = None
+    if _worker["with_heatmap"] and result.cam is not None:
+        heatmap = result.render_overlay(array)
+    return patient_id, result.label, result.prob, heatmap
+
+
+class InferenceWorkerPool:
+    """
+    Distribuye estudios entre N procesos de inferencia.
+
+    Parameters
+    ----------
+    config_path : str, optional
+        Ruta al archivo de configuración JSON (por defecto "config.json").
+        Se usan las claves ``model_path`` y, si existen, ``workers``,
+        ``intra_op_threads`` e ``inter_op_threads``; cada trabajador crea
+        un :class:`Integrator` con el mismo archivo.
+    n_workers : int, optional
+        Número de procesos. Por defecto ``workers`` de la configuración
+        o el número de núcleos.
+    intra_op_threads : int, optional
+        Hilos intra-op de TensorFlow por trabajador (por defecto 1).
+    inter_op_threads : int, optional
+        Hilos inter-op de TensorFlow por trabajador (por defecto 1).
+    with_heatmap : bool, optional
+        Si es True, cada resultado incluye el Grad-CAM (por defecto False).
+
+    Examples
+    --------
+    >>> with InferenceWorkerPool(n_workers=4) as pool:
+    ...     for patient_id, label, prob, _ in pool.map(studies):
+    ...         print(patient_id, label, prob)
+    """
+
+    def __init__(self, config_path: str = "config.json", n_workers: Optional[int] = None,
+                 intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None,
+                 with_heatmap: bool = False):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if "model_path" not in config:
+            raise KeyError("El archivo JSON debe contener 'model_path'.")
+
+        self.model_path = config["model_path"]
+        self.n_workers = n_workers or config.get("workers") or os.cpu_count() or 1
+        self.intra_op_threads = intra_op_threads or config.get("intra_op_threads", 1)
+        self.inter_op_threads = inter_op_threads or config.get("inter_op_threads", 1)
+
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(
+                f"No se encontró el archivo del modelo: {self.model_path}"
+            )
+
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(
+            processes=self.n_workers,
+            initializer=_init_worker,
+            initargs=(config_path, self.intra_op_threads, self.inter_op_threads, with_heatmap),
+        )
+
+    def map(self, studies: Iterable[Tuple[str, str]], chunksize: int = 1) -> Iterator[tuple]:
+        """
+        Procesa los estudios en paralelo conservando el orden de entrada.
+
+        Parameters
+        ----------
+        studies : iterable of tuple
+            Pares (patient_id, ruta al archivo DICOM).
+        chunksize : int, optional
+            Estudios enviados a cada trabajador por tarea.
+
+        Yields
+        ------
+        tuple
+            (patient_id, etiqueta, probabilidad en %, heatmap o None).
+        """
+        return self._pool.imap(_process_study, studies, chunksize)
+
+    def close(self):
+        """
+        Espera a que terminen las tareas pendientes y cierra los procesos.
+        """
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._pool.terminate()
+            self._pool.join()
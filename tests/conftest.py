@@ -0,0 +1,97 @@
+"""
+Fixtures compartidas por las pruebas.
+
+Se construye un modelo Keras diminuto con la misma interfaz que
+``conv_MLP_84.h5`` (entrada 512x512x1, capa ``conv10_thisone`` y salida
+softmax de 3 clases) para ejecutar pruebas sin el modelo real.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.neumonia.integrator import Integrator
+from src.neumonia.load_model import ModelLoader
+from src.neumonia.synthetic import write_dicom  # noqa: F401  (usado por las pruebas)
+
+
+def build_tiny_model(seed: int = 0) -> tf.keras.Model:
+    """
+    Construye un modelo pequeño compatible con el modelo de producción.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Semilla para inicializar los pesos.
+
+    Returns
+    -------
+    tf.keras.Model
+        Modelo con entrada (512, 512, 1) y salida de 3 clases.
+    """
+    tf.keras.utils.set_random_seed(seed)
+    inputs = tf.keras.Input(shape=(512, 512, 1))
+    x = tf.keras.layers.AveragePooling2D(pool_size=16)(inputs)
+    x = tf.keras.layers.Conv2D(4, 3, padding="same", activation="relu", name="conv10_thisone")(x)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(3, activation="softmax")(x)
+    return tf.keras.Model(inputs, outputs)
+
+
+@pytest.fixture
+def dicom_file(tmp_path):
+    """
+    Archivo DICOM sintético de 640x640 con 12 bits.
+    """
+    rng = np.random.default_rng(0)
+    return write_dicom(tmp_path / "study.dcm", rng.integers(0, 4096, (640, 640)))
+
+
+@pytest.fixture
+def tiny_model():
+    """
+    Modelo Keras diminuto en memoria.
+    """
+    return build_tiny_model()
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    """
+    Crea un modelo diminuto en disco y un config.json que apunta a él.
+
+    El Singleton de :class:`ModelLoader` se reinicia antes y después
+    de cada prueba.
+
+    Yields
+    ------
+    str
+        Ruta al archivo de configuración temporal.
+    """
+    ModelLoader._instance = None
+    ModelLoader._model = None
+    model_path = tmp_path / "model.h5"
+    build_tiny_model().save(model_path)
+    config = {
+        "model_path": str(model_path),
+        "csv_path": str(tmp_path / "csv" / "historial.csv"),
+        "pdf_path": str(tmp_path / "reportes"),
+        "cache_path": str(tmp_path / "cache"),
+    }
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+    yield str(config_path)
+    ModelLoader._instance = None
+    ModelLoader._model = None
+
+
+@pytest.fixture
+def integrator(app_config):
+    """
+    Integrador construido sobre la configuración temporal.
+    """
+    integrator = Integrator(config_path=app_config)
+    yield integrator
+    integrator.close()
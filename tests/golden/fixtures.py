@@ -0,0 +1,148 @@
+"""
+Entradas y referencias del conjunto dorado (golden) de regresión.
+
+Las entradas (DICOM de 12 y 16 bits, un DICOM multi-frame y un PNG RGB) se
+generan de forma determinista a partir de :data:`FIXTURES`; no se versionan,
+pero el SHA-256 de sus píxeles decodificados queda en ``reference.npz``
+junto con, por entrada y frame:
+
+- el tensor de :meth:`PreProcessor.preprocess` (en uint8, ya que sus
+  valores son múltiplos exactos de 1/255);
+- las probabilidades y el Grad-CAM del modelo dorado, un modelo diminuto
+  cuyos pesos también se guardan para no depender de la inicialización
+  aleatoria de cada versión de TensorFlow.
+
+Las referencias solo deben regenerarse cuando un cambio de resultados es
+intencional::
+
+    python -m tests.golden.fixtures
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.synthetic import write_dicom
+
+REFERENCE = Path(__file__).with_name("reference.npz")
+
+# Nombre -> formato, shape ((H, W) o (frames, H, W)), bits y semilla
+FIXTURES = {
+    "cr_12bit_640x576": {"format": "dicom", "shape": (576, 640), "bits": 12, "seed": 1},
+    "cr_16bit_384x448": {"format": "dicom", "shape": (448, 384), "bits": 16, "seed": 2},
+    "cr_multiframe_256": {"format": "dicom", "shape": (2, 256, 256), "bits": 12, "seed": 3},
+    "chest_rgb_600x520": {"format": "png", "shape": (520, 600), "bits": 8, "seed": 4},
+}
+
+
+def pixels(spec: dict) -> np.ndarray:
+    """
+    Píxeles de una entrada: campos pulmonares oscuros sobre fondo claro,
+    con ruido suavizado para que las referencias se compriman bien.
+    """
+    rng = np.random.default_rng(spec["seed"])
+    *frames, rows, cols = spec["shape"]
+    y = np.linspace(-1, 1, rows)[:, None]
+    x = np.linspace(-1, 1, cols)[None, :]
+    images = []
+    for _ in range(frames[0] if frames else 1):
+        image = 0.8 - 0.15 * (x ** 2 + y ** 2)
+        for center in (-0.4, 0.4):
+            lung = ((x - center - rng.uniform(-0.05, 0.05)) / 0.3) ** 2 + ((y + 0.05) / 0.6) ** 2
+            image = image - 0.45 * np.exp(-lung ** 2)
+        image = image + cv2.GaussianBlur(rng.normal(0, 0.03, (rows, cols)), (0, 0), 3)
+        images.append(np.clip(image, 0, 1) * ((1 << spec["bits"]) - 1))
+    return np.stack(images) if frames else images[0]
+
+
+def write_inputs(directory) -> Dict[str, str]:
+    """
+    Escribe todas las entradas en ``directory``.
+
+    Returns
+    -------
+    dict
+        Nombre -> ruta del archivo.
+    """
+    paths = {}
+    for name, spec in FIXTURES.items():
+        if spec["format"] == "png":
+            path = Path(directory) / f"{name}.png"
+            gray = pixels(spec).astype(np.uint8)
+            Image.fromarray(np.stack([gray, gray // 2 + 64, gray], axis=-1)).save(path)
+        else:
+            path = Path(directory) / f"{name}.dcm"
+            write_dicom(path, pixels(spec).astype(np.uint16), spec["bits"])
+        paths[name] = str(path)
+    return paths
+
+
+def load_frames(path: str) -> List[np.ndarray]:
+    """
+    Decodifica una entrada con la implementación actual: frames RGB uint8.
+    """
+    if path.endswith(".png"):
+        return [np.asarray(Image.open(path).convert("RGB"))]
+    return list(PreProcessor.iter_frames(path))
+
+
+def frames_sha256(frames: List[np.ndarray]) -> str:
+    """
+    SHA-256 de los frames decodificados (forma y contenido).
+    """
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(str(frame.shape).encode())
+        digest.update(np.ascontiguousarray(frame).tobytes())
+    return digest.hexdigest()
+
+
+def golden_model(reference=None):
+    """
+    Modelo dorado: la arquitectura de ``build_tiny_model`` con los pesos
+    guardados en ``reference`` (o pesos nuevos si no se da).
+    """
+    from tests.conftest import build_tiny_model
+
+    model = build_tiny_model(seed=0)
+    if reference is not None:
+        count = sum(1 for key in reference.files if key.startswith("model/"))
+        model.set_weights([reference[f"model/{i}"] for i in range(count)])
+    return model
+
+
+def build_reference(directory) -> Dict[str, np.ndarray]:
+    """
+    Calcula las referencias con la implementación actual.
+    """
+    from src.neumonia.grad_cam import GradCAMModel
+
+    model = golden_model()
+    gradcam = GradCAMModel(model)
+    arrays = {f"model/{i}": w for i, w in enumerate(model.get_weights())}
+    for name, path in write_inputs(directory).items():
+        frames = load_frames(path)
+        tensors = np.concatenate([PreProcessor.preprocess(f) for f in frames])
+        cams, preds = gradcam.compute_cam(tensors)
+        arrays[f"{name}/sha256"] = np.array(frames_sha256(frames))
+        arrays[f"{name}/tensor"] = np.rint(tensors[..., 0] * 255).astype(np.uint8)
+        arrays[f"{name}/preds"] = preds
+        arrays[f"{name}/cam"] = cams
+    return arrays
+
+
+def main():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        np.savez_compressed(REFERENCE, **build_reference(tmp))
+    print(f"Referencias guardadas en {REFERENCE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Pruebas para la fachada asíncrona `Integrator.aprocess`.
+"""
+
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tests.conftest import write_dicom
+
+
+def test_aprocess_shares_batches(integrator, tmp_path):
+    """
+    Verifica que las solicitudes concurrentes compartan pasadas del modelo
+    y devuelvan el mismo resultado que la predicción síncrona.
+    """
+    rng = np.random.default_rng(0)
+    paths = [
+        write_dicom(tmp_path / f"{i}.dcm", rng.integers(0, 4096, (300, 300)))
+        for i in range(6)
+    ]
+    calls = []
+    original = integrator.predict_preprocessed
+
+    def spy(img_batch, patient_ids, *args):
+        calls.append(len(img_batch))
+        return original(img_batch, patient_ids, *args)
+
+    integrator.predict_preprocessed = spy
+    integrator.config["async_max_delay"] = 0.2
+
+    async def run():
+        sources = paths[:5] + [Path(paths[5]).read_bytes()]
+        return await asyncio.gather(*[
+            integrator.aprocess(source, str(i)) for i, source in enumerate(sources)
+        ])
+
+    results = asyncio.run(run())
+    assert [r.patient_id for r in results] == [str(i) for i in range(6)]
+    assert sum(calls) == 6
+    assert len(calls) < 6
+    for path, result in zip(paths, results):
+        expected = integrator.predict(integrator.load_image(path)[0])
+        assert result.label == expected.label
+        assert result.prob == pytest.approx(expected.prob, abs=1e-3)
+
+
+def test_aprocess_timeout(integrator):
+    """
+    Verifica que una solicitud que excede el timeout se cancele.
+    """
+    array = np.zeros((300, 300, 3), dtype=np.uint8)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await integrator.aprocess(array, "lento", timeout=0)
+        # El batcher sigue atendiendo solicitudes después de la cancelación
+        return await integrator.aprocess(array, "rapido", timeout=30)
+
+    assert asyncio.run(run()).patient_id == "rapido"
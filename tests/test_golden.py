@@ -0,0 +1,179 @@
+"""
+Regresión contra el conjunto dorado de ``tests/golden``.
+
+Cada ruta de lectura, preprocesamiento e inferencia, incluidas las
+optimizadas, debe reproducir las referencias guardadas dentro de las
+tolerancias de este módulo. Si un cambio de resultados es intencional, las
+referencias se regeneran con ``python -m tests.golden.fixtures``.
+
+La prueba de tiempos compara contra una línea base de esta máquina: se
+activa con ``NEUMONIA_TIMING_BASELINE=<archivo.json>`` (si el archivo no
+existe se crea) y falla si una etapa es más lenta en más de
+``NEUMONIA_MAX_REGRESSION`` por ciento (20 por defecto).
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from benchmarks.stage_timing import compare, measure_stages
+from src.neumonia.integrator import Integrator
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.screening import ScreeningModel
+from tests.golden.fixtures import (
+    FIXTURES, REFERENCE, frames_sha256, golden_model, load_frames, write_inputs,
+)
+
+# Diferencia máxima de un píxel del tensor (un nivel de gris) y media
+TENSOR_ATOL = 1 / 255 + 1e-6
+TENSOR_MEAN_ATOL = 1e-3
+# Probabilidades y Grad-CAM del modelo completo
+PREDS_ATOL = 1e-4
+CAM_ATOL = 1e-2
+# Variante cuantizada del tamizaje
+QUANTIZED_ATOL = 0.02
+
+DICOM = [name for name, spec in FIXTURES.items() if spec["format"] == "dicom"]
+SINGLE_FRAME = [name for name in DICOM if len(FIXTURES[name]["shape"]) == 2]
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return np.load(REFERENCE)
+
+
+@pytest.fixture(scope="module")
+def inputs(tmp_path_factory):
+    return write_inputs(tmp_path_factory.mktemp("golden"))
+
+
+@pytest.fixture
+def golden_integrator(app_config, reference):
+    """
+    Integrador con el modelo dorado.
+    """
+    with open(app_config, "r", encoding="utf-8") as f:
+        model_path = json.load(f)["model_path"]
+    golden_model(reference).save(model_path)
+    integrator = Integrator(config_path=app_config)
+    yield integrator
+    integrator.close()
+
+
+def reference_tensor(reference, name):
+    return reference[f"{name}/tensor"][..., None] / 255.0
+
+
+def assert_tensor_close(actual, expected):
+    diff = np.abs(np.asarray(actual, dtype=np.float64) - expected)
+    assert diff.max() <= TENSOR_ATOL
+    assert diff.mean() <= TENSOR_MEAN_ATOL
+
+
+@pytest.mark.parametrize("name", list(FIXTURES))
+def test_inputs_unchanged(inputs, reference, name):
+    """
+    Las entradas generadas y su decodificación son las de las referencias.
+    """
+    assert frames_sha256(load_frames(inputs[name])) == str(reference[f"{name}/sha256"])
+
+
+@pytest.mark.parametrize("source", ["path", "bytes", "memoryview"])
+@pytest.mark.parametrize("name", SINGLE_FRAME)
+def test_read_dicom_paths(inputs, name, source):
+    """
+    ``read_dicom`` desde ruta o memoria decodifica lo mismo que
+    ``iter_frames``.
+    """
+    path = inputs[name]
+    data = Path(path).read_bytes()
+    argument = {"path": path, "bytes": data, "memoryview": memoryview(data)}[source]
+    array, _ = PreProcessor.read_dicom(argument)
+    np.testing.assert_array_equal(array, load_frames(path)[0])
+
+
+@pytest.mark.parametrize("name", list(FIXTURES))
+def test_preprocess_matches_reference(inputs, reference, name):
+    """
+    El tensor de entrada del modelo coincide con la referencia.
+    """
+    tensors = np.concatenate([PreProcessor.preprocess(f) for f in load_frames(inputs[name])])
+    assert tensors.shape[1:] == (512, 512, 1)
+    assert_tensor_close(tensors, reference_tensor(reference, name))
+
+
+@pytest.mark.parametrize("name", list(FIXTURES))
+def test_predictions_match_reference(golden_integrator, reference, name):
+    """
+    Probabilidades y Grad-CAM del modelo completo sobre el tensor de
+    referencia.
+    """
+    results = golden_integrator.predict_preprocessed(reference_tensor(reference, name))
+    np.testing.assert_allclose([r.probabilities for r in results],
+                               reference[f"{name}/preds"], atol=PREDS_ATOL)
+    np.testing.assert_allclose(np.stack([r.cam for r in results]).astype(np.float32),
+                               reference[f"{name}/cam"].astype(np.float32), atol=CAM_ATOL)
+
+
+@pytest.mark.parametrize("name", SINGLE_FRAME + ["chest_rgb_600x520"])
+def test_end_to_end_matches_reference(golden_integrator, inputs, reference, name):
+    """
+    Lectura, preprocesamiento y predicción encadenados por ``Integrator``.
+    """
+    result = golden_integrator.predict(load_frames(inputs[name])[0])
+    np.testing.assert_allclose(result.probabilities, reference[f"{name}/preds"][0],
+                               atol=PREDS_ATOL)
+
+
+def test_multiframe_study_matches_reference(golden_integrator, inputs, reference):
+    """
+    ``process_study`` evalúa cada frame como en la referencia.
+    """
+    study = golden_integrator.process_study(inputs["cr_multiframe_256"])
+    expected = reference["cr_multiframe_256/preds"]
+    np.testing.assert_allclose([f.probabilities for f in study.frames], expected,
+                               atol=PREDS_ATOL)
+    np.testing.assert_allclose(study.probabilities, expected.mean(axis=0), atol=PREDS_ATOL)
+
+
+def test_quantized_screening_matches_reference(reference, tmp_path):
+    """
+    La variante cuantizada del tamizaje queda cerca de la referencia.
+    """
+    screening = ScreeningModel.quantize(golden_model(reference))
+    for name in FIXTURES:
+        np.testing.assert_allclose(screening.predict(reference_tensor(reference, name)),
+                                   reference[f"{name}/preds"], atol=QUANTIZED_ATOL)
+
+
+def test_compare_flags_regressions():
+    """
+    Solo se informan las etapas que superan el porcentaje permitido.
+    """
+    baseline = {"read_dicom": 0.010, "preprocess": 0.004, "predict": 0.050}
+    current = {"read_dicom": 0.0115, "preprocess": 0.006, "predict": 0.040}
+    regressions = compare(current, baseline, max_regression=20)
+    assert list(regressions) == ["preprocess"]
+    assert regressions["preprocess"] == pytest.approx(50)
+
+
+@pytest.mark.skipif(not os.environ.get("NEUMONIA_TIMING_BASELINE"),
+                    reason="Activar con NEUMONIA_TIMING_BASELINE=<archivo.json>")
+def test_stage_timing_against_baseline(golden_integrator, inputs):
+    """
+    Ninguna etapa es más lenta que la línea base de esta máquina en más
+    del porcentaje permitido.
+    """
+    baseline_path = Path(os.environ["NEUMONIA_TIMING_BASELINE"])
+    max_regression = float(os.environ.get("NEUMONIA_MAX_REGRESSION", 20))
+    timings = measure_stages([inputs[name] for name in SINGLE_FRAME],
+                             golden_integrator.predict_preprocessed, repeats=7)
+    if not baseline_path.exists():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(timings, indent=2), encoding="utf-8")
+        pytest.skip(f"Línea base creada en {baseline_path}")
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    assert compare(timings, baseline, max_regression) == {}
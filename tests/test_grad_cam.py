@@ -122,3 +122,81 @@ def test_predict_and_grad_cam(dummy_image, mock_model):
     assert label in ["bacteriana", "normal", "viral"]
     assert 0 <= prob <= 100
     assert heatmap.shape == (512, 512, 3)
+
+
+def test_compute_cam_batch(tiny_model):
+    """
+    Verifica que el Grad-CAM por lotes coincida con el cálculo individual
+    y se devuelva a la resolución nativa de la capa en float16.
+    """
+    rng = np.random.default_rng(0)
+    batch = rng.random((3, 512, 512, 1)).astype(np.float32)
+    gradcam = GradCAMModel(tiny_model)
+
+    cams, preds = gradcam.compute_cam(batch)
+    assert cams.shape == (3, 32, 32)
+    assert cams.dtype == np.float16
+    assert preds.shape == (3, 3)
+    np.testing.assert_allclose(preds, tiny_model.predict(batch, verbose=0), atol=1e-5)
+    for i in range(3):
+        single, _ = gradcam.compute_cam(batch[i:i + 1])
+        np.testing.assert_allclose(cams[i], single[0], atol=1e-3)
+
+
+def test_lazy_heatmap(tiny_model):
+    """
+    Verifica que LazyHeatmap solo genere la superposición al usarse
+    y que coincida con el Grad-CAM completo.
+    """
+    from src.neumonia.grad_cam import LazyHeatmap
+
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 256, (600, 600, 3), dtype=np.uint8)
+    batch = rng.random((1, 512, 512, 1)).astype(np.float32)
+    gradcam = GradCAMModel(tiny_model)
+
+    cams, _ = gradcam.compute_cam(batch)
+    lazy = LazyHeatmap(cams[0], array)
+    assert not lazy.rendered
+    overlay = np.asarray(lazy)
+    assert lazy.rendered
+    assert overlay.shape == (512, 512, 3)
+    np.testing.assert_array_equal(overlay, gradcam.grad_cam(batch, array))
+
+
+def test_native_cam_and_thumbnail(tiny_model):
+    """
+    Verifica el Grad-CAM a resolución nativa y la superposición generada
+    directamente al tamaño de la miniatura de la interfaz.
+    """
+    import cv2
+    from src.neumonia.grad_cam import LazyHeatmap
+
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 256, (1024, 1024, 3), dtype=np.uint8)
+    batch = rng.random((1, 512, 512, 1)).astype(np.float32)
+    gradcam = GradCAMModel(tiny_model)
+
+    cam = gradcam.grad_cam(batch, array, native=True)
+    assert cam.shape == (32, 32)
+    assert cam.dtype == np.float16
+
+    lazy = LazyHeatmap(cam, array)
+    thumbnail = lazy.render((250, 250))
+    assert thumbnail.shape == (250, 250, 3)
+    assert lazy.render((250, 250)) is thumbnail
+    # Equivale a reducir la superposición de 512x512, sin el paso intermedio
+    reference = cv2.resize(lazy.render(), (250, 250), interpolation=cv2.INTER_AREA)
+    assert np.abs(thumbnail.astype(int) - reference.astype(int)).mean() < 8
+
+
+def test_grad_model_is_cached(tiny_model):
+    """
+    El modelo auxiliar del Grad-CAM se construye una sola vez por capa.
+    """
+    gradcam = GradCAMModel(tiny_model)
+    batch = np.zeros((1, 512, 512, 1), dtype=np.float32)
+    gradcam.compute_cam(batch)
+    grad_model = gradcam._grad_models["conv10_thisone"]
+    gradcam.compute_cam(batch)
+    assert gradcam._grad_models == {"conv10_thisone": grad_model}
@@ -0,0 +1,103 @@
+"""
+Pruebas para `SharedBuffer` e `InferenceProcessClient`.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.neumonia.inference_process import InferenceProcessClient, SharedBuffer
+from src.neumonia.pre_processor import PreProcessor
+from tests.conftest import write_dicom
+
+
+def test_shared_buffer_roundtrip(tmp_path):
+    """
+    Verifica que dos vistas del mismo descriptor compartan memoria.
+    """
+    buffer = SharedBuffer.create((4, 5, 3), "uint8", str(tmp_path))
+    other = SharedBuffer.attach(buffer.descriptor)
+    other.array[1, 2] = [1, 2, 3]
+    assert buffer.array[1, 2].tolist() == [1, 2, 3]
+
+    buffer.unlink()
+    assert not os.path.exists(buffer.path)
+    # La vista sigue siendo válida tras eliminar el archivo
+    assert other.array[1, 2].tolist() == [1, 2, 3]
+
+
+def test_client_matches_in_process(app_config, dicom_file):
+    """
+    Verifica que el proceso de inferencia decodifique en el buffer
+    compartido y prediga igual que en el mismo proceso.
+    """
+    from src.neumonia.grad_cam import GradCAMModel
+    from src.neumonia.load_model import ModelLoader
+
+    client = InferenceProcessClient(config_path=app_config)
+    try:
+        array, img_pil = client.load_image(dicom_file)
+        expected, _ = PreProcessor.read_dicom(dicom_file)
+        np.testing.assert_array_equal(array, expected)
+        assert img_pil.size == (640, 640)
+
+        label, prob, heatmap = client.process_image_from_array(array, "123")
+        copied = client.predict(expected.copy(), "123")
+        assert (copied.label, copied.prob) == (label, pytest.approx(prob))
+        assert heatmap.shape == (512, 512, 3)
+
+        gradcam = GradCAMModel(ModelLoader(config_file=app_config).load_model())
+        cams, preds = gradcam.compute_cam(PreProcessor.preprocess(expected))
+        np.testing.assert_allclose(copied.probabilities, preds[0], atol=1e-5)
+        np.testing.assert_allclose(copied.cam, cams[0], atol=1e-3)
+    finally:
+        client.close()
+
+
+def test_client_loads_first_frame(app_config, tmp_path):
+    """
+    Verifica que de un DICOM multi-frame se cargue el primer frame en un
+    buffer del tamaño del encabezado.
+    """
+    rng = np.random.default_rng(0)
+    path = write_dicom(tmp_path / "multi.dcm", rng.integers(0, 4096, (3, 300, 200)))
+
+    client = InferenceProcessClient(config_path=app_config)
+    try:
+        array, _ = client.load_image(path)
+        assert array.shape == (300, 200, 3)
+        np.testing.assert_array_equal(array, next(PreProcessor.iter_frames(path)))
+    finally:
+        client.close()
+
+
+def test_client_applies_integrator_config(app_config, dicom_file):
+    """
+    Verifica que el proceso de inferencia respete la configuración del
+    integrador (aquí ``tta_threshold``) y dé el mismo resultado que
+    `Integrator.process_image_from_array`.
+    """
+    import json
+
+    from src.neumonia.integrator import Integrator
+
+    with open(app_config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["tta_threshold"] = 1.01
+    with open(app_config, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+
+    integrator = Integrator(config_path=app_config)
+    client = InferenceProcessClient(config_path=app_config)
+    try:
+        array, _ = client.load_image(dicom_file)
+        label, prob, _ = client.process_image_from_array(array, "123")
+        expected_label, expected_prob, _ = integrator.process_image_from_array(
+            np.array(array), "123"
+        )
+        assert (label, prob) == (expected_label, pytest.approx(expected_prob, abs=1e-3))
+        assert client.predict(array, "123", cascade=False).views > 1
+    finally:
+        client.close()
+        integrator.close()
@@ -0,0 +1,399 @@
+"""
+Pruebas para la clase `Integrator`.
+
+Se usa el modelo diminuto de ``conftest.py`` en lugar de ``conv_MLP_84.h5``.
+"""
+
+import os
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.neumonia.integrator import Integrator
+
+
+@pytest.fixture
+def dummy_array():
+    """
+    Imagen RGB simulada de 600x600.
+    """
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (600, 600, 3), dtype=np.uint8)
+
+
+def test_process_image_from_array(integrator, dummy_array):
+    """
+    Verifica la salida de una predicción completa.
+    """
+    label, prob, heatmap = integrator.process_image_from_array(dummy_array, "123")
+    assert label in ["bacteriana", "normal", "viral"]
+    assert 0 <= prob <= 100
+    assert heatmap.shape == (512, 512, 3)
+    assert heatmap.dtype == np.uint8
+
+
+def test_hot_reload_swaps_engine(app_config, tmp_path, dummy_array):
+    """
+    Verifica que la recarga en caliente reemplace modelo y Grad-CAM juntos.
+    """
+    from tests.conftest import build_tiny_model
+
+    integrator = Integrator(config_path=app_config, hot_reload=True, reload_interval=60)
+    try:
+        old_model, old_gradcam = integrator.model, integrator.gradcam
+
+        new_path = tmp_path / "model_v2.h5"
+        build_tiny_model(seed=1).save(new_path)
+        with open(app_config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        config["model_path"] = str(new_path)
+        with open(app_config, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+        assert integrator.watcher.check()
+        assert integrator.model is not old_model
+        assert integrator.gradcam is not old_gradcam
+        assert integrator.gradcam.model is integrator.model
+        # El Grad-CAM nuevo se calentó en el hilo del watcher, antes del reemplazo
+        assert "conv10_thisone" in integrator.gradcam._grad_models
+        label, _, _ = integrator.process_image_from_array(dummy_array, "123")
+        assert label in ["bacteriana", "normal", "viral"]
+    finally:
+        integrator.close()
+
+
+def test_process_image_lazy_heatmap(integrator, dummy_array):
+    """
+    Verifica que el modo perezoso devuelva la misma superposición que el
+    modo normal, generada solo al solicitarla.
+    """
+    label, prob, heatmap = integrator.process_image_from_array(dummy_array, "123")
+    lazy_label, lazy_prob, lazy = integrator.process_image_from_array(
+        dummy_array, "123", lazy_heatmap=True
+    )
+    assert (lazy_label, lazy_prob) == (label, prob)
+    assert not lazy.rendered
+    np.testing.assert_array_equal(lazy.render(), heatmap)
+
+
+def test_predict_batch_compact_results(integrator, dummy_array):
+    """
+    Verifica que los resultados compactos coincidan con la predicción
+    individual y ocupen solo unos KB.
+    """
+    arrays = [dummy_array, dummy_array[::-1].copy()]
+    results = integrator.predict_batch(arrays, ["a", "b"])
+
+    assert [r.patient_id for r in results] == ["a", "b"]
+    for array, result in zip(arrays, results):
+        label, prob, heatmap = integrator.process_image_from_array(array, result.patient_id)
+        assert result.label == label
+        assert result.prob == pytest.approx(prob, abs=1e-3)
+        assert result.probabilities.dtype == np.float32
+        assert result.nbytes < 16 * 1024
+        np.testing.assert_array_equal(result.render_overlay(array), heatmap)
+    assert not hasattr(results[0], "__dict__")
+
+
+def test_tta_only_below_threshold(app_config, dummy_array):
+    """
+    Verifica que la test-time augmentation se aplique solo a predicciones
+    inciertas, con todas las vistas en una sola llamada al modelo.
+    """
+    from src.neumonia.pre_processor import PreProcessor
+
+    integrator = Integrator(config_path=app_config, tta_threshold=1.01)
+    try:
+        calls = []
+        original = integrator.model.predict
+
+        def spy(batch, **kwargs):
+            calls.append(len(batch))
+            return original(batch, **kwargs)
+
+        integrator._engine[0].predict = spy
+        results = integrator.predict_batch([dummy_array, dummy_array[::-1].copy()])
+        views = len(PreProcessor.augment(dummy_array))
+        assert calls == [2 * views]
+        for result in results:
+            assert result.views == views + 1
+            assert result.probabilities.sum() == pytest.approx(1.0, abs=1e-4)
+
+        calls.clear()
+        integrator.tta_threshold = 0.0
+        assert integrator.predict_batch([dummy_array])[0].views == 1
+        assert calls == []
+    finally:
+        integrator.close()
+
+
+def test_process_study_multiframe_and_series(integrator, tmp_path):
+    """
+    Verifica la agregación de un estudio con un DICOM multi-frame y una
+    segunda serie, evaluado en lotes más pequeños que el número de frames.
+    """
+    from tests.conftest import write_dicom
+
+    rng = np.random.default_rng(0)
+    study = tmp_path / "estudio"
+    (study / "serie2").mkdir(parents=True)
+    write_dicom(study / "multi.dcm", rng.integers(1, 4096, (3, 200, 200)))
+    write_dicom(study / "serie2" / "single.dcm", rng.integers(1, 4096, (200, 200)))
+
+    result = integrator.process_study(str(study), "123", batch_size=2)
+    assert len(result.frames) == 4
+    assert len(result.series) == 2
+    frame_probs = np.stack([f.probabilities for f in result.frames])
+    np.testing.assert_allclose(result.probabilities, frame_probs.mean(axis=0), atol=1e-6)
+    assert result.label in ["bacteriana", "normal", "viral"]
+    assert result.frames[1].patient_id.endswith("multi.dcm#1")
+
+    (tmp_path / "vacia").mkdir()
+    with pytest.raises(ValueError):
+        integrator.process_study(str(tmp_path / "vacia"))
+
+
+def test_load_preview_uses_cache(integrator, dicom_file):
+    """
+    La primera apertura decodifica y guarda la vista previa; la segunda
+    la toma de la caché sin decodificar, y un cambio del archivo la invalida.
+    """
+    preview, array = integrator.load_preview(dicom_file)
+    assert preview.size == (250, 250)
+    assert array is not None and array.shape[:2] == (640, 640)
+
+    with patch.object(integrator, "load_image") as load_image:
+        cached, array = integrator.load_preview(dicom_file)
+    load_image.assert_not_called()
+    assert array is None
+    assert np.array_equal(np.asarray(cached), np.asarray(preview))
+
+    stat = os.stat(dicom_file)
+    os.utime(dicom_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    _, array = integrator.load_preview(dicom_file)
+    assert array is not None
+
+
+def test_release_memory_over_budget(app_config, dummy_array):
+    """
+    Al superar ``max_rss_mb`` se libera memoria cada
+    ``memory_check_interval`` imágenes y las predicciones no cambian.
+    """
+    integrator = Integrator(config_path=app_config, max_rss_mb=1)
+    integrator.memory_check_interval = 2
+    try:
+        expected = integrator.predict(dummy_array).probabilities
+        for _ in range(4):
+            result = integrator.predict(dummy_array)
+        assert integrator.memory_releases == 2
+        np.testing.assert_allclose(result.probabilities, expected, rtol=1e-5)
+    finally:
+        integrator.close()
+
+
+def test_release_memory_waits_for_inflight(integrator):
+    """
+    No se libera memoria mientras hay una predicción en curso.
+    """
+    with integrator._inference():
+        assert not integrator.release_memory()
+    assert integrator.release_memory()
+
+
+@pytest.mark.skipif(not os.environ.get("NEUMONIA_SOAK"),
+                    reason="Prueba larga; activar con NEUMONIA_SOAK=1")
+def test_soak_rss_stays_flat(integrator, dummy_array):
+    """
+    10.000 predicciones seguidas no hacen crecer la memoria residente.
+    """
+    from src.neumonia.resources import current_rss_bytes
+
+    for _ in range(200):
+        integrator.predict(dummy_array)
+    baseline = current_rss_bytes()
+    for _ in range(10_000):
+        integrator.predict(dummy_array)
+    growth_mb = (current_rss_bytes() - baseline) / 2 ** 20
+    assert growth_mb < 16
+
+
+def test_cascade_escalates_only_uncertain(integrator, dummy_array):
+    """
+    Con la cascada, los normales seguros se resuelven en el tamizaje sin
+    Grad-CAM y el resto pasa al modelo completo.
+    """
+    class FakeScreening:
+        def predict(self, img_batch):
+            return np.array([[0.02, 0.97, 0.01], [0.5, 0.4, 0.1]], dtype=np.float32)
+
+    integrator._engine = integrator._engine._replace(screening=FakeScreening())
+    integrator.cascade_threshold = 0.9
+    full = integrator.predict_batch([dummy_array], ["b"], cascade=False)[0]
+
+    cleared, escalated = integrator.predict_batch([dummy_array, dummy_array], ["a", "b"])
+    assert cleared.screened and cleared.cam is None
+    assert cleared.label == "normal" and cleared.patient_id == "a"
+    assert not escalated.screened and escalated.patient_id == "b"
+    np.testing.assert_allclose(escalated.probabilities, full.probabilities, rtol=1e-5)
+
+    # La interfaz siempre obtiene el Grad-CAM
+    _, _, heatmap = integrator.process_image_from_array(dummy_array, "c", lazy_heatmap=True)
+    assert heatmap.cam is not None
+
+
+def test_cascade_builds_quantized_screening(app_config, dummy_array):
+    """
+    Sin ``screening_model_path`` el tamizaje es la variante cuantizada del
+    modelo principal, guardada en ``cache_path``.
+    """
+    integrator = Integrator(config_path=app_config, cascade_threshold=1.01)
+    try:
+        cache_dir = os.path.join(integrator.config["cache_path"], "screening")
+        assert os.listdir(cache_dir) == [f"{integrator.model_loader.model_version}.tflite"]
+        result = integrator.predict(dummy_array)
+        assert not result.screened and result.cam is not None
+    finally:
+        integrator.close()
+
+
+def test_hot_reload_rebuilds_screening(app_config, tmp_path, capsys):
+    """
+    Con la cascada activa, la recarga en caliente cuantiza el nuevo modelo
+    antes del reemplazo y el tamizaje cambia junto con el modelo.
+    """
+    from tests.conftest import build_tiny_model
+
+    integrator = Integrator(config_path=app_config, hot_reload=True, reload_interval=60,
+                            cascade_threshold=0.9)
+    try:
+        old_screening = integrator.screening
+        new_path = tmp_path / "model_v2.h5"
+        build_tiny_model(seed=1).save(new_path)
+        with open(app_config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        config["model_path"] = str(new_path)
+        with open(app_config, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+        assert integrator.watcher.check()
+        model, _, screening, version = integrator._engine
+        assert screening is not None and screening is not old_screening
+        assert integrator.screening is screening and integrator.model is model
+        assert version == integrator.model_version == integrator.model_loader.model_version
+        cache_dir = os.path.join(integrator.config["cache_path"], "screening")
+        assert f"{integrator.model_loader.model_version}.tflite" in os.listdir(cache_dir)
+        # El conversor de TFLite no escribe en stdout
+        assert "Saved artifact" not in capsys.readouterr().out
+
+        # Liberar memoria conserva el tamizaje
+        assert integrator.release_memory()
+        assert integrator.screening is screening
+    finally:
+        integrator.close()
+
+
+def test_load_image_multiframe(integrator, tmp_path):
+    """
+    Verifica que un DICOM multi-frame se cargue por su primer frame, igual
+    que en el proceso de inferencia aparte.
+    """
+    from src.neumonia.pre_processor import PreProcessor
+    from tests.conftest import write_dicom
+
+    rng = np.random.default_rng(0)
+    path = write_dicom(tmp_path / "multi.dcm", rng.integers(0, 4096, (3, 300, 200)))
+
+    array, img_pil = integrator.load_image(path)
+    assert array.shape == (300, 200, 3) and img_pil.size == (200, 300)
+    np.testing.assert_array_equal(array, PreProcessor.read_first_frame(path))
+    np.testing.assert_array_equal(array, next(PreProcessor.iter_frames(path)))
+    preview, _ = integrator.load_preview(path)
+    assert preview.size[0] <= 250
+    assert integrator.predict(array).label in ["bacteriana", "normal", "viral"]
+
+
+def test_hot_reload_rejects_model_without_gradcam_layer(app_config, tmp_path):
+    """
+    Un modelo que no sirve para el Grad-CAM se descarta sin cambiar el motor
+    ni la versión registrada, y el watcher sigue aceptando recargas.
+    """
+    import tensorflow as tf
+    from tests.conftest import build_tiny_model
+
+    integrator = Integrator(config_path=app_config, hot_reload=True, reload_interval=60)
+    try:
+        engine, version = integrator._engine, integrator.model_version
+
+        inputs = tf.keras.Input(shape=(512, 512, 1))
+        x = tf.keras.layers.GlobalAveragePooling2D()(inputs)
+        broken_path = tmp_path / "sin_capa.h5"
+        tf.keras.Model(inputs, tf.keras.layers.Dense(3, activation="softmax")(x)).save(broken_path)
+
+        def point_to(path):
+            with open(app_config, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            config["model_path"] = str(path)
+            with open(app_config, "w", encoding="utf-8") as f:
+                json.dump(config, f)
+
+        point_to(broken_path)
+        assert not integrator.watcher.check()
+        assert isinstance(integrator.watcher.errors[0], ValueError)
+        assert integrator._engine is engine
+        assert integrator.model_loader.model_version == version == integrator.model_version
+        # El mismo archivo no se vuelve a intentar
+        assert not integrator.watcher.check()
+        assert len(integrator.watcher.errors) == 1
+
+        good_path = tmp_path / "model_v2.h5"
+        build_tiny_model(seed=1).save(good_path)
+        point_to(good_path)
+        assert integrator.watcher.check()
+        assert integrator.model_version == integrator.model_loader.model_version != version
+    finally:
+        integrator.close()
+
+
+def test_release_memory_waits_for_hot_reload(app_config, tmp_path):
+    """
+    Mientras el watcher carga el nuevo modelo no se libera memoria, y la
+    liberación posterior conserva el modelo recargado.
+    """
+    import threading
+    from tests.conftest import build_tiny_model
+
+    integrator = Integrator(config_path=app_config, hot_reload=True, reload_interval=60)
+    try:
+        new_path = tmp_path / "model_v2.h5"
+        build_tiny_model(seed=1).save(new_path)
+        with open(app_config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        config["model_path"] = str(new_path)
+        with open(app_config, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+        loading, proceed = threading.Event(), threading.Event()
+        prepare = integrator.model_loader.prepare_reload
+
+        def slow_prepare():
+            loading.set()
+            proceed.wait(10)
+            return prepare()
+
+        with patch.object(integrator.model_loader, "prepare_reload", slow_prepare):
+            reload = threading.Thread(target=integrator.watcher.check)
+            reload.start()
+            assert loading.wait(10)
+            assert not integrator.release_memory()
+            proceed.set()
+            reload.join(30)
+
+        new_version = integrator.model_version
+        assert new_version == integrator.model_loader.model_version
+        assert integrator.release_memory()
+        assert integrator.model_version == new_version
+        assert integrator.model is integrator.model_loader.load_model()
+    finally:
+        integrator.close()
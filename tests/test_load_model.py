@@ -76,3 +76,63 @@ def test_model_file_not_found(tmp_path):
     loader = ModelLoader(config_file=str(config_path))
     with pytest.raises(FileNotFoundError):
         loader.load_model()
+
+
+def test_hot_reload_swaps_model(app_config, tmp_path):
+    """
+    Verifica que ModelWatcher recargue el modelo cuando cambia
+    ``model_path`` en la configuración, sin afectar al modelo anterior.
+    """
+    from src.neumonia.load_model import ModelWatcher
+    from tests.conftest import build_tiny_model
+
+    loader = ModelLoader(config_file=app_config)
+    old_model = loader.load_model()
+    assert not loader.has_changed()
+
+    new_path = tmp_path / "model_v2.h5"
+    build_tiny_model(seed=1).save(new_path)
+    with open(app_config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["model_path"] = str(new_path)
+    with open(app_config, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+
+    reloaded = []
+    watcher = ModelWatcher(loader, on_reload=lambda model, version: reloaded.append(model))
+    assert watcher.check()
+    assert loader.load_model() is not old_model
+    assert reloaded == [loader.load_model()]
+    assert loader.model_path == str(new_path)
+    assert not watcher.check()
+
+
+def test_hot_reload_keeps_model_on_error(app_config):
+    """
+    Verifica que un ``model_path`` inexistente no reemplace el modelo activo.
+    """
+    from src.neumonia.load_model import ModelWatcher
+
+    loader = ModelLoader(config_file=app_config)
+    model = loader.load_model()
+    with open(app_config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["model_path"] = "non_existent_model.h5"
+    with open(app_config, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+
+    watcher = ModelWatcher(loader)
+    assert not watcher.check()
+    assert loader.load_model() is model
+    assert isinstance(watcher.errors[0], FileNotFoundError)
+
+
+def test_configure_threads_after_init(tiny_model):
+    """
+    Con TensorFlow ya inicializado, pedir otros valores emite un aviso y
+    no falla; repetir los actuales no requiere cambios.
+    """
+    current = tf.config.threading.get_intra_op_parallelism_threads()
+    assert ModelLoader.configure_threads(current or None, None)
+    with pytest.warns(RuntimeWarning):
+        assert not ModelLoader.configure_threads(current + 3)
@@ -0,0 +1,92 @@
+"""
+Pruebas para `StreamingPipeline` y `watch_directory`.
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.neumonia.pipeline import StreamingPipeline, watch_directory
+from tests.conftest import write_dicom
+
+
+@pytest.fixture
+def studies(tmp_path):
+    """
+    Cinco estudios DICOM sintéticos en disco.
+    """
+    rng = np.random.default_rng(0)
+    return [
+        write_dicom(tmp_path / f"p{i}.dcm", rng.integers(0, 4096, (300, 300)))
+        for i in range(5)
+    ]
+
+
+def test_pipeline_paths_and_bytes(integrator, studies):
+    """
+    Verifica que rutas y buffers de bytes produzcan los mismos resultados
+    que la predicción directa, en el orden de llegada.
+    """
+    sources = studies[:3] + [("bytes", memoryview(Path(studies[3]).read_bytes()))]
+    pipeline = StreamingPipeline(integrator, queue_size=2, batch_size=2, save_csv=True)
+    results = list(pipeline.run(sources))
+
+    assert [r.patient_id for r in results] == ["p0", "p1", "p2", "bytes"]
+    for path, result in zip(studies, results):
+        array, _ = integrator.load_image(path)
+        expected = integrator.predict(array)
+        assert result.label == expected.label
+        assert result.prob == pytest.approx(expected.prob, abs=1e-3)
+    with open(integrator.csv_handler.csv_path) as f:
+        assert len(f.readlines()) == 4
+
+
+def test_pipeline_backpressure(integrator, studies):
+    """
+    Verifica que la lectura no se adelante más allá de las colas acotadas
+    aunque la entrada sea infinita.
+    """
+    consumed = []
+
+    def endless():
+        while True:
+            consumed.append(1)
+            yield studies[0]
+
+    stream = StreamingPipeline(integrator, queue_size=1).run(endless())
+    next(stream)
+    threading.Event().wait(0.5)
+    # Una cola por etapa, un elemento en cada etapa y el ya entregado
+    assert len(consumed) <= 6
+    stream.close()
+
+
+def test_pipeline_skip_errors(integrator, studies, tmp_path):
+    """
+    Verifica que un archivo corrupto se omita y se registre.
+    """
+    broken = tmp_path / "broken.dcm"
+    broken.write_bytes(b"no es un DICOM")
+    pipeline = StreamingPipeline(integrator, skip_errors=True)
+    results = list(pipeline.run([studies[0], str(broken), studies[1]]))
+
+    assert [r.patient_id for r in results] == ["p0", "p1"]
+    assert pipeline.errors[0][0] == "broken"
+
+    with pytest.raises(Exception):
+        list(StreamingPipeline(integrator).run([str(broken)]))
+
+
+def test_watch_directory(studies, tmp_path):
+    """
+    Verifica que cada archivo se entregue una sola vez.
+    """
+    stop = threading.Event()
+    found = []
+    for path in watch_directory(str(tmp_path), interval=0.01, settle=0, stop_event=stop):
+        found.append(path)
+        if len(found) == len(studies):
+            stop.set()
+    assert sorted(found) == sorted(studies)
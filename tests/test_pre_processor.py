@@ -8,6 +8,7 @@ operaciones reales de procesamiento de imagen.
 """
 
 import numpy as np
+import pytest
 from unittest.mock import patch, MagicMock
 from src.neumonia.pre_processor import PreProcessor
 
@@ -50,3 +51,95 @@ def test_preprocess(mock_cv2):
     assert isinstance(result, np.ndarray), "La salida debe ser un np.ndarray"
     assert result.shape == (1, 512, 512, 1), "La salida debe tener forma (1, 512, 512, 1)"
     assert np.all((0 <= result) & (result <= 1)), "Todos los valores deben estar normalizados entre 0 y 1"
+
+
+def test_read_dicom_from_memory(dicom_file):
+    """
+    Verifica que leer desde bytes, bytearray o memoryview dé el mismo
+    resultado que leer desde la ruta.
+    """
+    import io
+    from pathlib import Path
+
+    expected, _ = PreProcessor.read_dicom(dicom_file)
+    data = Path(dicom_file).read_bytes()
+    for source in (data, bytearray(data), memoryview(data), io.BytesIO(data)):
+        img_rgb, _ = PreProcessor.read_dicom(source)
+        np.testing.assert_array_equal(img_rgb, expected)
+
+
+def test_scan_headers(tmp_path):
+    """
+    Verifica el índice de encabezados, el filtro y que se omitan archivos
+    que no son DICOM.
+    """
+    from tests.conftest import write_dicom
+
+    write_dicom(tmp_path / "a.dcm", np.zeros((40, 50)))
+    (tmp_path / "sub").mkdir()
+    write_dicom(tmp_path / "sub" / "b.dcm", np.zeros((60, 70)))
+    (tmp_path / "roto.dcm").write_bytes(b"no es un DICOM")
+
+    headers = PreProcessor.scan_headers(str(tmp_path))
+    assert [(h["Rows"], h["Columns"]) for h in headers] == [(40, 50), (60, 70)]
+    assert headers[0]["Modality"] == "CR"
+    assert headers[0]["NumberOfFrames"] == 1
+    assert headers[0]["path"] == str(tmp_path / "a.dcm")
+
+    large = PreProcessor.scan_headers(str(tmp_path), where=lambda h: h["Rows"] > 50)
+    assert [h["path"] for h in large] == [str(tmp_path / "sub" / "b.dcm")]
+
+
+def test_augment():
+    """
+    Verifica forma, rango y que el espejo sea exacto.
+    """
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (300, 300, 3), dtype=np.uint8)
+    views = PreProcessor.augment(img)
+    base = PreProcessor.preprocess(img)
+
+    assert views.shape == (7, 512, 512, 1)
+    assert np.all((0 <= views) & (views <= 1))
+    np.testing.assert_array_equal(views[0], base[0][:, ::-1])
+
+
+def test_iter_frames_multiframe(tmp_path):
+    """
+    Verifica que cada frame se entregue por separado y normalizado.
+    """
+    from tests.conftest import write_dicom
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(1, 4096, (3, 40, 50))
+    path = write_dicom(tmp_path / "multi.dcm", frames)
+
+    result = list(PreProcessor.iter_frames(path))
+    assert len(result) == 3
+    for frame, original in zip(result, frames):
+        assert frame.shape == (40, 50, 3)
+        np.testing.assert_array_equal(frame, PreProcessor.to_rgb(original))
+
+
+def test_make_preview():
+    """
+    La vista previa tiene el tamaño pedido y conserva la intensidad media.
+    """
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 256, (2100, 1900, 3), dtype=np.uint8)
+    preview = PreProcessor.make_preview(array, (250, 250))
+    assert preview.shape == (250, 250, 3)
+    assert preview.dtype == np.uint8
+    assert abs(float(preview.mean()) - float(array.mean())) < 2
+
+
+def test_to_rgb_writes_into_out():
+    """
+    Verifica que `to_rgb` escriba en ``out`` y rechace formas distintas.
+    """
+    frame = np.random.default_rng(0).integers(0, 4096, (30, 20))
+    out = np.zeros((30, 20, 3), dtype=np.uint8)
+    assert PreProcessor.to_rgb(frame, out) is out
+    np.testing.assert_array_equal(out, PreProcessor.to_rgb(frame))
+    with pytest.raises(ValueError):
+        PreProcessor.to_rgb(frame, np.zeros((20, 30, 3), dtype=np.uint8))
@@ -0,0 +1,50 @@
+"""
+Pruebas para `ScreeningModel`, la primera pasada de la cascada.
+"""
+
+import numpy as np
+import pytest
+
+from src.neumonia.screening import ScreeningModel
+
+
+def test_quantized_matches_keras(tiny_model, tmp_path):
+    """
+    La variante cuantizada predice casi lo mismo que el modelo original y
+    se guarda en la caché para no convertirse de nuevo.
+    """
+    rng = np.random.default_rng(0)
+    batch = rng.random((3, 512, 512, 1), dtype=np.float32)
+    screening = ScreeningModel.quantize(tiny_model, cache_dir=str(tmp_path), version="v1")
+    expected = tiny_model.predict(batch, verbose=0)
+    np.testing.assert_allclose(screening.predict(batch), expected, atol=0.02)
+    assert (tmp_path / "v1.tflite").exists()
+
+    cached = ScreeningModel.quantize(None, cache_dir=str(tmp_path), version="v1")
+    np.testing.assert_allclose(cached.predict(batch[:1]), screening.predict(batch[:1]))
+
+
+def test_load_downscaled_model(tmp_path):
+    """
+    Un modelo de tamizaje propio con entrada menor recibe el lote reducido.
+    """
+    import tensorflow as tf
+
+    inputs = tf.keras.Input(shape=(128, 128, 1))
+    x = tf.keras.layers.GlobalAveragePooling2D()(inputs)
+    outputs = tf.keras.layers.Dense(3, activation="softmax")(x)
+    path = tmp_path / "screening.keras"
+    tf.keras.Model(inputs, outputs).save(path)
+
+    screening = ScreeningModel.load(str(path))
+    assert screening.input_size == (128, 128)
+    preds = screening.predict(np.zeros((2, 512, 512, 1), dtype=np.float32))
+    assert preds.shape == (2, 3)
+
+
+def test_load_missing():
+    """
+    Un modelo de tamizaje inexistente lanza FileNotFoundError.
+    """
+    with pytest.raises(FileNotFoundError):
+        ScreeningModel.load("no_existe.tflite")
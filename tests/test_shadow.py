@@ -0,0 +1,157 @@
+"""
+Pruebas para el modo sombra (`ShadowScorer`) y su registro en `StudyIndex`.
+"""
+
+import csv
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.neumonia.integrator import Integrator
+from src.neumonia.result import PredictionResult
+from src.neumonia.shadow import ShadowScorer
+from src.neumonia.study_index import StudyIndex
+from tests.conftest import build_tiny_model
+
+
+@pytest.fixture
+def shadow_config(app_config, tmp_path):
+    """
+    Configuración con dos candidatos: una copia del modelo principal y un
+    modelo con otros pesos.
+    """
+    config = json.loads(open(app_config, encoding="utf-8").read())
+    candidate = tmp_path / "candidato.h5"
+    build_tiny_model(seed=1).save(candidate)
+    config["shadow_models"] = {"copia": config["model_path"], "candidato": str(candidate)}
+    config["shadow_db_path"] = str(tmp_path / "index" / "studies.sqlite")
+    with open(app_config, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return app_config
+
+
+def test_shadow_records_every_model(shadow_config, tmp_path):
+    """
+    Cada lote se registra para el modelo principal y cada candidato, con el
+    mismo preprocesamiento.
+    """
+    integrator = Integrator(config_path=shadow_config)
+    rng = np.random.default_rng(0)
+    arrays = [rng.integers(0, 256, (600, 600, 3), dtype=np.uint8) for _ in range(3)]
+    try:
+        results = integrator.predict_batch(arrays, ["a", "b", "c"])
+        integrator.predict(arrays[0], "d")
+        integrator.shadow.join_queue()
+        assert integrator.shadow.errors == []
+    finally:
+        integrator.close()
+
+    index = StudyIndex(str(tmp_path / "index" / "studies.sqlite"))
+    summary = {row["model"]: row for row in index.shadow_summary()}
+    assert set(summary) == {"primary", "copia", "candidato"}
+    assert all(row["studies"] == 4 for row in summary.values())
+    assert summary["copia"]["agreement"] == 1.0
+    assert summary["candidato"]["mean_latency_ms"] > 0
+
+    copy = index.conn.execute(
+        "SELECT probabilities FROM shadow_scores WHERE model = 'copia' AND patient_id = 'a'"
+    ).fetchone()
+    np.testing.assert_allclose(json.loads(copy[0]), results[0].probabilities, atol=1e-5)
+
+    exported = tmp_path / "sombra.csv"
+    assert index.export_shadow_csv(str(exported)) == 12
+    with open(exported, newline="", encoding="utf-8") as f:
+        assert next(csv.reader(f))[:4] == ["batch_id", "position", "patient_id", "model"]
+    index.close()
+
+
+def test_reserved_model_names(tmp_path):
+    """
+    Los candidatos no pueden usar los nombres del modelo principal ni del
+    tamizaje.
+    """
+    for name in ("primary", "screening"):
+        with pytest.raises(ValueError):
+            ShadowScorer({name: "modelo.h5"}, str(tmp_path / "s.sqlite"))
+
+
+def test_submit_drops_when_full(tmp_path):
+    """
+    Con la cola llena el lote se descarta en lugar de bloquear.
+    """
+    shadow = ShadowScorer({}, str(tmp_path / "s.sqlite"), queue_size=1)
+    result = PredictionResult.from_outputs(np.array([0.2, 0.7, 0.1]), np.zeros((2, 2)), "a")
+    batch = np.zeros((1, 512, 512, 1), dtype=np.float32)
+    assert shadow.submit(batch, [result], 0.01, "v")
+    assert not shadow.submit(batch, [result], 0.01, "v")
+    assert shadow.dropped == 1
+
+
+def test_shadow_records_final_and_screened_results(shadow_config, tmp_path):
+    """
+    Los estudios resueltos en el tamizaje se registran como ``screening`` y
+    los del modelo principal con las probabilidades finales de la TTA.
+    """
+    class FakeScreening:
+        version = "tamizaje-v1"
+
+        def predict(self, img_batch):
+            return np.array([[0.02, 0.97, 0.01], [0.5, 0.4, 0.1]], dtype=np.float32)
+
+    integrator = Integrator(config_path=shadow_config, tta_threshold=1.01)
+    integrator._engine = integrator._engine._replace(screening=FakeScreening())
+    integrator.cascade_threshold = 0.9
+    rng = np.random.default_rng(0)
+    arrays = [rng.integers(0, 256, (600, 600, 3), dtype=np.uint8) for _ in range(2)]
+    try:
+        cleared, escalated = integrator.predict_batch(arrays, ["a", "b"])
+        integrator.shadow.join_queue()
+    finally:
+        integrator.close()
+    assert cleared.screened and escalated.views > 1
+
+    index = StudyIndex(str(tmp_path / "index" / "studies.sqlite"))
+    rows = {
+        (row["patient_id"], row["model"]): row
+        for row in index.conn.execute("SELECT * FROM shadow_scores").fetchall()
+    }
+    assert ("a", "primary") not in rows
+    assert rows[("a", "screening")]["model_version"] == "tamizaje-v1"
+    assert rows[("b", "primary")]["model_version"] == integrator.model_loader.model_version
+    np.testing.assert_allclose(json.loads(rows[("b", "primary")]["probabilities"]),
+                               escalated.probabilities, atol=1e-6)
+    # La concordancia solo compara estudios evaluados por el modelo principal
+    summary = {row["model"]: row for row in index.shadow_summary()}
+    assert summary["candidato"]["studies"] == 1
+    index.close()
+
+
+def test_scorer_survives_write_errors(tmp_path, monkeypatch):
+    """
+    Un error al guardar un lote se registra y el hilo sigue atendiendo la
+    cola; ``stop`` termina.
+    """
+    calls = []
+
+    def put_shadow(self, rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(StudyIndex, "put_shadow", put_shadow)
+    shadow = ShadowScorer({}, str(tmp_path / "s.sqlite"))
+    shadow.start()
+    result = PredictionResult.from_outputs(np.array([0.2, 0.7, 0.1]), np.zeros((2, 2)), "a")
+    batch = np.zeros((1, 512, 512, 1), dtype=np.float32)
+    assert shadow.submit(batch, [result], 0.01, "v")
+    assert shadow.submit(batch, [result], 0.01, "v")
+    shadow.join_queue()
+    assert calls == [1, 1]
+    assert isinstance(shadow.errors[0], sqlite3.OperationalError)
+    assert shadow.is_alive()
+    shadow.stop(timeout=10)
+    assert not shadow.is_alive()
+    # Detener un hilo ya terminado no bloquea
+    shadow.stop(timeout=1)
@@ -0,0 +1,49 @@
+"""
+Pruebas para `StudyIndex` e `IncrementalScorer`.
+"""
+
+import os
+import shutil
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.neumonia.study_index import IncrementalScorer, StudyIndex
+from tests.conftest import write_dicom
+
+
+def test_incremental_scoring(integrator, tmp_path):
+    """
+    Verifica que una segunda corrida solo evalúe los archivos nuevos o
+    modificados y reutilice resultados de contenido idéntico.
+    """
+    studies = tmp_path / "studies"
+    studies.mkdir()
+    rng = np.random.default_rng(0)
+    for i in range(3):
+        write_dicom(studies / f"{i}.dcm", rng.integers(0, 4096, (200, 200)))
+
+    index = StudyIndex(str(tmp_path / "index" / "studies.sqlite"))
+    scorer = IncrementalScorer(integrator, index)
+    assert scorer.run(str(studies)) == {"scored": 3, "reused": 0, "skipped": 0, "failed": 0}
+    assert len(index) == 3
+
+    # Sin cambios: no se ejecuta el modelo
+    integrator.predict_preprocessed = MagicMock(side_effect=AssertionError)
+    assert scorer.run(str(studies)) == {"scored": 0, "reused": 0, "skipped": 3, "failed": 0}
+
+    # Copia con el mismo contenido y archivo tocado sin cambiar contenido
+    shutil.copy(studies / "0.dcm", studies / "copia.dcm")
+    os.utime(studies / "1.dcm", ns=(0, 0))
+    assert scorer.run(str(studies)) == {"scored": 0, "reused": 2, "skipped": 2, "failed": 0}
+    version = integrator.model_loader.model_version
+    original = index.get(str(studies / "0.dcm"), version)
+    copy = index.get(str(studies / "copia.dcm"), version)
+    assert copy["probabilities"] == original["probabilities"]
+
+    # Archivo con contenido nuevo: se evalúa solo ese
+    del integrator.predict_preprocessed
+    write_dicom(studies / "2.dcm", rng.integers(0, 4096, (200, 200)))
+    (studies / "roto.dcm").write_bytes(b"no es un DICOM")
+    assert scorer.run(str(studies)) == {"scored": 1, "reused": 0, "skipped": 3, "failed": 1}
+    index.close()
@@ -0,0 +1,55 @@
+"""
+Pruebas para los datos y el modelo sintéticos de `synthetic`.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from src.neumonia.pre_processor import PreProcessor
+from src.neumonia.synthetic import build_standin_model, generate_dataset, write_standin_config
+
+
+def test_generate_dataset(tmp_path):
+    """
+    Verifica tamaños, profundidad de bits y que los archivos sean legibles.
+    """
+    paths = generate_dataset(str(tmp_path), 3, min_size=64, max_size=96, bits=(12, 16), seed=1)
+    assert len(paths) == 3
+    for path in paths:
+        header = PreProcessor.read_header(path)
+        assert 64 <= header["Rows"] <= 96 and 64 <= header["Columns"] <= 96
+        assert header["BitsStored"] in (12, 16)
+        img_rgb, _ = PreProcessor.read_dicom(path)
+        assert img_rgb.shape == (header["Rows"], header["Columns"], 3)
+    # Reproducible con la misma semilla
+    again = generate_dataset(str(tmp_path / "otra"), 3, min_size=64, max_size=96, seed=1)
+    np.testing.assert_array_equal(
+        PreProcessor.read_dicom(again[0])[0], PreProcessor.read_dicom(paths[0])[0]
+    )
+
+
+def test_standin_model_interface():
+    """
+    Verifica que el modelo sustituto tenga la interfaz de conv_MLP_84.h5.
+    """
+    model = build_standin_model()
+    assert tuple(model.input_shape) == (None, 512, 512, 1)
+    assert model.get_layer("conv10_thisone") is not None
+    preds = model.predict(np.zeros((2, 512, 512, 1), dtype=np.float32), verbose=0)
+    assert preds.shape == (2, 3)
+    np.testing.assert_allclose(preds.sum(axis=1), 1.0, atol=1e-5)
+
+
+def test_write_standin_config(tmp_path):
+    """
+    Verifica que la configuración apunte al modelo sustituto y deje las
+    salidas dentro de la carpeta.
+    """
+    config_path = write_standin_config(str(tmp_path))
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    assert os.path.exists(config["model_path"])
+    for key in ("csv_path", "pdf_path", "cache_path"):
+        assert config[key].startswith(str(tmp_path))
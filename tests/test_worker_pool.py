@@ -0,0 +1,55 @@
+"""
+Pruebas para `InferenceWorkerPool`.
+
+Los trabajadores se lanzan con ``spawn`` y cargan el modelo diminuto
+de ``conftest.py``.
+"""
+
+import numpy as np
+
+from src.neumonia.worker_pool import InferenceWorkerPool
+from tests.conftest import write_dicom
+
+
+def test_worker_pool_map(app_config, tmp_path):
+    """
+    Verifica que el pool procese todos los estudios conservando el orden.
+    """
+    rng = np.random.default_rng(0)
+    studies = [
+        (str(i), write_dicom(tmp_path / f"{i}.dcm", rng.integers(0, 4096, (600, 600))))
+        for i in range(4)
+    ]
+
+    with InferenceWorkerPool(config_path=app_config, n_workers=2, with_heatmap=True) as pool:
+        results = list(pool.map(studies))
+
+    assert [r[0] for r in results] == ["0", "1", "2", "3"]
+    for _, label, prob, heatmap in results:
+        assert label in ["bacteriana", "normal", "viral"]
+        assert 0 <= prob <= 100
+        assert heatmap.shape == (512, 512, 3)
+
+
+def test_process_study_uses_integrator(integrator, tmp_path, monkeypatch):
+    """
+    Verifica que cada trabajador prediga con su `Integrator`, de modo que
+    respete opciones como ``tta_threshold``.
+    """
+    from src.neumonia import worker_pool
+    integrator.tta_threshold = 1.01
+    calls = []
+    apply_tta = integrator._apply_tta
+    monkeypatch.setattr(integrator, "_apply_tta",
+                        lambda engine, arrays, results:
+                        calls.append(len(arrays)) or apply_tta(engine, arrays, results))
+    monkeypatch.setitem(worker_pool._worker, "integrator", integrator)
+    monkeypatch.setitem(worker_pool._worker, "with_heatmap", True)
+    path = write_dicom(tmp_path / "0.dcm", np.random.default_rng(0).integers(0, 4096, (600, 600)))
+
+    patient_id, label, prob, heatmap = worker_pool._process_study(("0", path))
+
+    assert calls == [1]
+    assert (patient_id, label) == ("0", integrator.predict(integrator.load_image(path)[0]).label)
+    assert 0 <= prob <= 100
+    assert heatmap.shape == (512, 512, 3)